@@ -9,7 +9,6 @@ import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.frames.frames import LLMMessagesFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.task import PipelineParams, PipelineTask
@@ -17,14 +16,14 @@ from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
 
 from nvidia_pipecat.pipeline.ace_pipeline_runner import ACEPipelineRunner, PipelineMetadata
 from nvidia_pipecat.processors.nvidia_context_aggregator import (
-    # NvidiaTTSResponseCacher, # Uncomment to enable speculative speech processing
+    NvidiaTTSResponseCacher,
     create_nvidia_context_aggregator,
 )
 from nvidia_pipecat.processors.transcript_synchronization import (
     BotTranscriptSynchronization,
     UserTranscriptSynchronization,
 )
-from nvidia_pipecat.services.nvidia_rag import NvidiaRAGService
+from nvidia_pipecat.services.cached_nvidia_rag import CachedNvidiaRAGService
 from nvidia_pipecat.services.riva_speech import RivaASRService, RivaTTSService
 from nvidia_pipecat.transports.network.ace_fastapi_websocket import (
     ACETransport,
@@ -32,11 +31,45 @@ from nvidia_pipecat.transports.network.ace_fastapi_websocket import (
 )
 from nvidia_pipecat.transports.services.ace_controller.routers.websocket_router import router as websocket_router
 from nvidia_pipecat.utils.logging import setup_default_ace_logging
+from nvidia_pipecat.utils.vad import create_silero_vad_analyzer
+from nvidia_pipecat.utils.warmup import riva_warmup_lifespan
 
 load_dotenv(override=True)
 
 setup_default_ace_logging(level="INFO")
 
+# Read once at startup. Only needed for NVCF hosted Riva models, a local Riva server works without it
+NVIDIA_API_KEY = os.getenv("NVIDIA_API_KEY")
+
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a helpful Large Language Model. "
+    "Your goal is to demonstrate your capabilities in a succinct way. "
+    "Your output will be converted to audio so don't include special characters in your answers. "
+    "Respond to what the user said in a creative and helpful way.",
+}
+
+
+def create_riva_services() -> tuple[RivaASRService, RivaTTSService]:
+    """Create the Riva speech services used by the pipeline."""
+    stt = RivaASRService(
+        server="localhost:50051",
+        api_key=NVIDIA_API_KEY,
+        language="en-US",
+        sample_rate=16000,
+        model="parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble",
+    )
+    tts = RivaTTSService(
+        server="localhost:50051",
+        api_key=NVIDIA_API_KEY,
+        voice_id="English-US.Female-1",
+        language="en-US",
+        zero_shot_quality=20,
+        sample_rate=16000,
+        model="fastpitch-hifigan-tts",
+    )
+    return stt, tts
+
 
 async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
     """Create the pipeline to be run.
@@ -50,48 +83,30 @@ async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
     transport = ACETransport(
         websocket=pipeline_metadata.websocket,
         params=ACETransportParams(
-            vad_analyzer=SileroVADAnalyzer(),
+            vad_analyzer=create_silero_vad_analyzer(),
+            # Send TTS audio to the client in 200 ms websocket messages instead of the default 40 ms
+            audio_out_10ms_chunks=20,
         ),
     )
 
     # Please set your nvidia rag collection name here
-    rag = NvidiaRAGService(collection_name="nvidia_blogs")
+    # Near-duplicate questions are answered from a shared response cache instead of the RAG server
+    rag = CachedNvidiaRAGService(collection_name="nvidia_blogs")
 
-    stt = RivaASRService(
-        server="localhost:50051",
-        api_key=os.getenv("NVIDIA_API_KEY"),
-        language="en-US",
-        sample_rate=16000,
-        model="parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble",
-    )
-    tts = RivaTTSService(
-        server="localhost:50051",
-        api_key=os.getenv("NVIDIA_API_KEY"),
-        voice_id="English-US.Female-1",
-        language="en-US",
-        zero_shot_quality=20,
-        sample_rate=16000,
-        model="fastpitch-hifigan-tts",
-    )
+    stt, tts = create_riva_services()
 
-    messages = [
-        {
-            "role": "system",
-            "content": "You are a helpful Large Language Model. "
-            "Your goal is to demonstrate your capabilities in a succinct way. "
-            "Your output will be converted to audio so don't include special characters in your answers. "
-            "Respond to what the user said in a creative and helpful way.",
-        }
-    ]
+    # Fresh list per session: the context appends the conversation to it
+    messages = [SYSTEM_MESSAGE]
 
     context = OpenAILLMContext(messages)
     # Required components for Speculative Speech Processing
     # - Nvidia Context aggregator: Handles interim transcripts and early response generation
-    # send_interims=False: Only process final transcripts
-    # Set send_interims=True to process interim transcripts when enabling speculative speech processing
-    nvidia_context_aggregator = create_nvidia_context_aggregator(context, send_interims=False)
+    # send_interims=True: Start RAG retrieval on stable interim transcripts. NvidiaRAGService cancels the
+    # in-flight request whenever a newer context arrives, so superseded interims are dropped.
+    # Set send_interims=False (and remove the cacher below) to only process final transcripts
+    nvidia_context_aggregator = create_nvidia_context_aggregator(context, send_interims=True)
     # - TTS response cacher: Manages response timing and delivery for natural conversation flow
-    # nvidia_tts_response_cacher = NvidiaTTSResponseCacher() # Uncomment to enable speculative speech processing
+    nvidia_tts_response_cacher = NvidiaTTSResponseCacher()
 
     # Used to synchronize the user and bot transcripts in the UI
     stt_transcript_synchronization = UserTranscriptSynchronization()
@@ -107,7 +122,7 @@ async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
             tts,  # Text-To-Speech
             # Caches TTS responses for coordinated delivery in speculative
             # speech processing
-            # nvidia_tts_response_cacher, # Uncomment to enable speculative speech processing
+            nvidia_tts_response_cacher,
             tts_transcript_synchronization,
             transport.output(),  # Websocket output to client
             nvidia_context_aggregator.assistant(),
@@ -135,10 +150,11 @@ async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
     return task
 
 
-app = FastAPI()
+app = FastAPI(lifespan=riva_warmup_lifespan(create_riva_services))
 app.include_router(websocket_router)
 runner = ACEPipelineRunner.create_instance(pipeline_callback=create_pipeline_task)
 app.mount("/static", StaticFiles(directory=os.path.join(os.path.dirname(__file__), "../static")), name="static")
 
+
 if __name__ == "__main__":
-    uvicorn.run("bot:app", host="0.0.0.0", port=8100, workers=1)
+    uvicorn.run("bot:app", host="0.0.0.0", port=8100, workers=1, loop="uvloop", ws="websockets")
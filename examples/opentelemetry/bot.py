@@ -9,6 +9,10 @@ import uuid
 
 from fastapi import FastAPI
 from opentelemetry import metrics, trace
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from pipecat.frames.frames import TextFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
@@ -17,6 +21,11 @@ from pipecat.processors.frame_processor import FrameProcessor
 
 from nvidia_pipecat.utils.tracing import AttachmentStrategy, traceable, traced
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 app = FastAPI()
 
 tracer = trace.get_tracer("opentelemetry-pipecat-example")
@@ -35,15 +44,22 @@ class DummyProcessor(FrameProcessor):
     async def process_frame(self, frame, direction):
         """Process a frame."""
         await super().process_frame(frame, direction)
-        trace.get_current_span().add_event("Before inner")
+        # Only record events if the span is sampled and exported, otherwise this is wasted work per frame
+        if (span := trace.get_current_span()).is_recording():
+            span.add_event("Before inner")
         with tracer.start_as_current_span("inner") as span:
-            span.add_event("inner event")
+            if span.is_recording():
+                span.add_event("inner event")
             await self.child()
             await self.linked()
             await self.none()
-        trace.get_current_span().add_event("After inner")
-        async for f in self.generator():
-            print(f"{f}")
+        if (span := trace.get_current_span()).is_recording():
+            span.add_event("After inner")
+        # Only text frames trigger output so nothing is pushed before the StartFrame or after the
+        # EndFrame. Each generated chunk is pushed downstream as soon as it is produced.
+        if isinstance(frame, TextFrame):
+            async for f in self.generator():
+                await super().push_frame(f, direction)
         await super().push_frame(frame, direction)
 
     @traced
@@ -52,32 +68,51 @@ class DummyProcessor(FrameProcessor):
         # This span is attached as CHILD meaning that it will
         # be attached to the class span if no parent or to its
         # parent otherwise.
-        trace.get_current_span().add_event("child")
+        if (span := trace.get_current_span()).is_recording():
+            span.add_event("child")
 
     @traced(attachment_strategy=AttachmentStrategy.LINK)
     async def linked(self):
         """Example method for the DummyProcessor."""
         # This span is attached as LINK meaning it will be attached
         # to the class span but linked to its parent.
-        trace.get_current_span().add_event("linked")
+        if (span := trace.get_current_span()).is_recording():
+            span.add_event("linked")
 
     @traced(attachment_strategy=AttachmentStrategy.NONE)
     async def none(self):
         """Example method for the DummyProcessor."""
         # This span is attached as NONE meaning it will be attached
         # to the class span even if nested under another span.
-        trace.get_current_span().add_event("none")
+        if (span := trace.get_current_span()).is_recording():
+            span.add_event("none")
 
     @traced
     async def generator(self):
         """Example method for the DummyProcessor."""
         yield TextFrame("Hello, ")
-        trace.get_current_span().add_event("generated!")
+        if (span := trace.get_current_span()).is_recording():
+            span.add_event("generated!")
         yield TextFrame("World")
 
 
+def setup_tracing():
+    """Export spans in batches from a background thread unless a tracer provider is already configured.
+
+    When the bot runs under `opentelemetry-instrument` the provider set up by the instrumentation is
+    kept. Do not replace the `BatchSpanProcessor` with a `SimpleSpanProcessor` for real workloads: it
+    exports every span synchronously when it ends, which blocks the event loop on each frame.
+    """
+    if isinstance(trace.get_tracer_provider(), TracerProvider):
+        return
+    provider = TracerProvider(resource=Resource.create({SERVICE_NAME: "pipecat-opentelemetry"}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(), max_queue_size=2048, schedule_delay_millis=500))
+    trace.set_tracer_provider(provider)
+
+
 async def main():
     """Main function of the bot."""
+    setup_tracing()
     with tracer.start_as_current_span("pipeline-root-span") as span:
         span.set_attribute("stream_id", str(uuid.uuid4()))
         logger.info("Started building pipeline")
@@ -95,4 +130,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -13,11 +13,9 @@ import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.frames.frames import TranscriptionFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.task import PipelineParams, PipelineTask
-from pipecat.processors.aggregators.sentence import SentenceAggregator
 from pipecat.services.nim import NimLLMService
 from pipecat.transcriptions.language import Language
 from pipecat.utils.time import time_now_iso8601
@@ -34,11 +32,42 @@ from nvidia_pipecat.transports.network.ace_fastapi_websocket import (
 )
 from nvidia_pipecat.transports.services.ace_controller.routers.websocket_router import router as websocket_router
 from nvidia_pipecat.utils.logging import setup_default_ace_logging
+from nvidia_pipecat.utils.vad import create_silero_vad_analyzer
+from nvidia_pipecat.utils.warmup import riva_warmup_lifespan
 
 load_dotenv(override=True)
 
 setup_default_ace_logging(level="INFO")
 
+# Read once at startup and shared by the Riva services and the NIM LLM
+NVIDIA_API_KEY = os.getenv("NVIDIA_API_KEY")
+
+# Please update the stt and tts language, voice id as needed
+# tts voice id as per the language can be selected from https://docs.nvidia.com/deeplearning/riva/user-guide/docs/tts/tts-overview.html
+language = Language.ES_US
+voice_id = "English-US.Female-1"
+
+
+def create_riva_services() -> tuple[RivaASRService, RivaTTSService]:
+    """Create the Riva speech services used by the pipeline."""
+    stt = RivaASRService(
+        server="localhost:50051",
+        api_key=NVIDIA_API_KEY,
+        language=language,
+        sample_rate=16000,
+        model="parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble",
+    )
+    tts = RivaTTSService(
+        server="localhost:50051",
+        api_key=NVIDIA_API_KEY,
+        voice_id=voice_id,
+        language=language,
+        zero_shot_quality=20,
+        sample_rate=16000,
+        model="fastpitch-hifigan-tts",
+    )
+    return stt, tts
+
 
 async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
     """Create the pipeline to be run.
@@ -52,41 +81,22 @@ async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
     transport = ACETransport(
         websocket=pipeline_metadata.websocket,
         params=ACETransportParams(
-            vad_analyzer=SileroVADAnalyzer(),
+            vad_analyzer=create_silero_vad_analyzer(),
+            # Send TTS audio to the client in 200 ms websocket messages instead of the default 40 ms
+            audio_out_10ms_chunks=20,
         ),
     )
 
     llm = NimLLMService(
-        api_key=os.getenv("NVIDIA_API_KEY"),
+        api_key=NVIDIA_API_KEY,
         model="nvdev/meta/llama-3.1-8b-instruct",
     )
 
-    # Please update the stt and tts language, voice id as needed
-    # tts voice id as per the language can be selected from https://docs.nvidia.com/deeplearning/riva/user-guide/docs/tts/tts-overview.html
-    language = Language.ES_US
-    voice_id = "English-US.Female-1"
-
+    # Both translation directions share a single gRPC channel to the Riva server
     nmt1 = RivaNMTService(source_language=language, target_language=Language.EN_US)
     nmt2 = RivaNMTService(source_language=Language.EN_US, target_language=language)
 
-    stt = RivaASRService(
-        server="localhost:50051",
-        api_key=os.getenv("NVIDIA_API_KEY"),
-        language=language,
-        sample_rate=16000,
-        model="parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble",
-    )
-    tts = RivaTTSService(
-        server="localhost:50051",
-        api_key=os.getenv("NVIDIA_API_KEY"),
-        voice_id=voice_id,
-        language=language,
-        zero_shot_quality=20,
-        sample_rate=16000,
-        model="fastpitch-hifigan-tts",
-    )
-
-    sentence_aggregator = SentenceAggregator()
+    stt, tts = create_riva_services()
 
     pipeline = Pipeline(
         [
@@ -94,8 +104,7 @@ async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
             stt,
             nmt1,
             llm,
-            sentence_aggregator,
-            nmt2,
+            nmt2,  # Translates the LLM response sentence by sentence as it streams in
             tts,
             transport.output(),
         ]
@@ -121,10 +130,11 @@ async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
     return task
 
 
-app = FastAPI()
+app = FastAPI(lifespan=riva_warmup_lifespan(create_riva_services))
 app.include_router(websocket_router)
 runner = ACEPipelineRunner.create_instance(pipeline_callback=create_pipeline_task)
 app.mount("/static", StaticFiles(directory=os.path.join(os.path.dirname(__file__), "../static")), name="static")
 
+
 if __name__ == "__main__":
-    uvicorn.run("bot:app", host="0.0.0.0", port=8100, workers=1)
+    uvicorn.run("bot:app", host="0.0.0.0", port=8100, workers=1, loop="uvloop", ws="websockets")
@@ -6,6 +6,7 @@
 import os
 
 import uvicorn
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -14,7 +15,6 @@ from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
 from langchain_openai import ChatOpenAI
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.frames.frames import LLMMessagesFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.task import PipelineParams, PipelineTask
@@ -35,67 +35,88 @@ from nvidia_pipecat.transports.network.ace_fastapi_websocket import (
 )
 from nvidia_pipecat.transports.services.ace_controller.routers.websocket_router import router as websocket_router
 from nvidia_pipecat.utils.logging import setup_default_ace_logging
+from nvidia_pipecat.utils.vad import create_silero_vad_analyzer
+from nvidia_pipecat.utils.warmup import riva_warmup_lifespan
 
 load_dotenv(override=True)
 
 setup_default_ace_logging(level="INFO")
 
-message_store = {}
+# Read once at startup. Only needed for NVCF hosted Riva models, a local Riva server works without it
+NVIDIA_API_KEY = os.getenv("NVIDIA_API_KEY")
+
+# Chat histories of abandoned sessions are evicted after an hour of inactivity, and the
+# least recently used ones once the store is full, so memory stays bounded
+message_store = TTLCache(maxsize=10_000, ttl=3600)
+
+# The prompt template and the LLM client are stateless, so they are built once and shared by all sessions.
+# Per-session state lives in the message history.
+prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "Be nice and helpful. Answer very briefly and without special characters like `#` or `*`. "
+            "Your response will be synthesized to voice and those characters will create unnatural sounds.",
+        ),
+        MessagesPlaceholder("chat_history"),
+        ("human", "{input}"),
+    ]
+)
+llm = ChatOpenAI(model="gpt-4o", temperature=0.7)
 
 
 def get_session_history(session_id: str) -> BaseChatMessageHistory:
     """Get the session history."""
-    if session_id not in message_store:
-        message_store[session_id] = ChatMessageHistory()
-    return message_store[session_id]
-
-
-async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
-    """Create the pipeline to be run.
-
-    Args:
-        pipeline_metadata (PipelineMetadata): Metadata containing websocket and other pipeline configuration.
+    history = message_store.get(session_id)
+    if history is None:
+        history = ChatMessageHistory()
+    # Re-inserting restarts the TTL, so only inactive sessions expire
+    message_store[session_id] = history
+    return history
 
-    Returns:
-        PipelineTask: The configured pipeline task for handling speech-to-speech conversation.
-    """
-    transport = ACETransport(
-        websocket=pipeline_metadata.websocket,
-        params=ACETransportParams(
-            vad_analyzer=SileroVADAnalyzer(),
-        ),
-    )
 
+def create_riva_services() -> tuple[RivaASRService, RivaTTSService]:
+    """Create the Riva speech services used by the pipeline."""
     stt = RivaASRService(
         server="localhost:50051",
-        api_key=os.getenv("NVIDIA_API_KEY"),
+        api_key=NVIDIA_API_KEY,
         language="en-US",
         sample_rate=16000,
         model="parakeet-1.1b-en-US-asr-streaming-silero-vad-asr-bls-ensemble",
     )
     tts = RivaTTSService(
         server="localhost:50051",
-        api_key=os.getenv("NVIDIA_API_KEY"),
+        api_key=NVIDIA_API_KEY,
         voice_id="English-US.Female-1",
         language="en-US",
         zero_shot_quality=20,
         sample_rate=16000,
         model="fastpitch-hifigan-tts",
     )
+    return stt, tts
 
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                "Be nice and helpful. Answer very briefly and without special characters like `#` or `*`. "
-                "Your response will be synthesized to voice and those characters will create unnatural sounds.",
-            ),
-            MessagesPlaceholder("chat_history"),
-            ("human", "{input}"),
-        ]
+
+async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
+    """Create the pipeline to be run.
+
+    Args:
+        pipeline_metadata (PipelineMetadata): Metadata containing websocket and other pipeline configuration.
+
+    Returns:
+        PipelineTask: The configured pipeline task for handling speech-to-speech conversation.
+    """
+    transport = ACETransport(
+        websocket=pipeline_metadata.websocket,
+        params=ACETransportParams(
+            vad_analyzer=create_silero_vad_analyzer(),
+            # Send TTS audio to the client in 200 ms websocket messages instead of the default 40 ms
+            audio_out_10ms_chunks=20,
+        ),
     )
 
-    chain = prompt | ChatOpenAI(model="gpt-4o", temperature=0.7)
+    stt, tts = create_riva_services()
+
+    chain = prompt | llm
     history_chain = RunnableWithMessageHistory(
         chain,
         get_session_history,
@@ -141,10 +162,11 @@ async def create_pipeline_task(pipeline_metadata: PipelineMetadata):
     return task
 
 
-app = FastAPI()
+app = FastAPI(lifespan=riva_warmup_lifespan(create_riva_services))
 app.include_router(websocket_router)
 runner = ACEPipelineRunner.create_instance(pipeline_callback=create_pipeline_task)
 app.mount("/static", StaticFiles(directory=os.path.join(os.path.dirname(__file__), "../static")), name="static")
 
+
 if __name__ == "__main__":
-    uvicorn.run("bot:app", host="0.0.0.0", port=8100, workers=1)
+    uvicorn.run("bot:app", host="0.0.0.0", port=8100, workers=1, loop="uvloop", ws="websockets")
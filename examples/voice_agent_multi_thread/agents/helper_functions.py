@@ -1,7 +1,191 @@
-"""Helper functions for multi-threaded agent coordination and progress tracking."""
+"""Helper functions for multi-threaded agent coordination and progress tracking.
 
-from typing import Any, Dict
-from langgraph.store.base import BaseStore
+Only the standard library is imported at runtime, so clients and the voice pipeline can use
+`current_progress` without the LangGraph server packages.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from langgraph.store.base import BaseStore
+
+logger = logging.getLogger(__name__)
+
+# The agents load this file either as a package module or by path under the name "helper_functions"
+# (see the import fallbacks in tools.py and react_agent.py). Register it under the latter name too so
+# both import paths share one module, and therefore one status queue and flusher thread.
+sys.modules.setdefault("helper_functions", sys.modules[__name__])
+
+STATUS_KEY = "working-tool-status-update"
+
+# Updates arriving within this window of each other are coalesced into a single write,
+# but a batch is never held back longer than _MAX_BATCH_SECONDS
+_QUIESCENCE_SECONDS = 0.05
+_MAX_BATCH_SECONDS = 0.5
+
+
+@dataclass(slots=True)
+class ToolStatus:
+    """Status and progress of a long-running tool.
+
+    A running tool with a known duration records when it started instead of writing every
+    progress step; readers derive the current progress with `current_progress`.
+    """
+
+    tool_name: str
+    progress: int
+    status: str
+    started_at: float | None = None
+    duration: float | None = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the mapping stored under STATUS_KEY."""
+        value = {"tool_name": self.tool_name, "progress": self.progress, "status": self.status}
+        if self.started_at is not None and self.duration:
+            value["started_at"] = self.started_at
+            value["duration"] = self.duration
+        return value
+
+
+def current_progress(value: Dict[str, Any]) -> Any:
+    """Return the progress of a status mapping stored under STATUS_KEY.
+
+    While a tool with a recorded start time and duration is running, the progress is derived
+    from the elapsed wall-clock time; otherwise the stored progress is returned.
+    """
+    started_at = value.get("started_at")
+    duration = value.get("duration")
+    if value.get("status") == "running" and started_at is not None and duration:
+        return min(99, max(0, int((time.time() - started_at) * 100 / duration)))
+    return value.get("progress")
+
+
+# Latest pending "running" update per (store, namespace), written by the flusher thread.
+# Final writes and resets bypass it: see `_write_now`.
+_pending: Dict[tuple, tuple[BaseStore, tuple, ToolStatus]] = {}
+_pending_cond = threading.Condition()
+_queued = 0  # updates queued since the last flush
+# Held while writing to the store, so a pending update taken by the flusher cannot land
+# after a synchronous write to the same namespace
+_write_lock = threading.Lock()
+_flusher_lock = threading.Lock()
+_flusher_thread: threading.Thread | None = None
+
+
+# Last status read per namespace: (monotonic read time, value or None). Reads within _STATUS_CACHE_TTL
+# of each other share one store round trip. Every status write drops the entry of its namespace.
+_STATUS_CACHE_TTL = 0.5
+_STATUS_CACHE_MAXSIZE = 1024
+_status_cache: OrderedDict[tuple, tuple[float, Dict[str, Any] | None]] = OrderedDict()
+_status_cache_lock = threading.Lock()
+_status_writes = 0  # status writes so far, so a read that raced a write is not cached
+
+
+def _invalidate_status(namespace: tuple) -> None:
+    global _status_writes
+    with _status_cache_lock:
+        _status_cache.pop(namespace, None)
+        _status_writes += 1
+
+
+def _store_write(store: BaseStore, namespace: tuple, value: ToolStatus | None) -> None:
+    try:
+        if value is None:
+            store.delete(namespace, STATUS_KEY)
+        else:
+            store.put(namespace, STATUS_KEY, value.as_dict())
+    except Exception:
+        # A missing key on delete is fine; anything else is worth reporting
+        if value is not None:
+            logger.exception("❌ write_status FAILED: namespace=%s key=%s", namespace, STATUS_KEY)
+    finally:
+        _invalidate_status(namespace)
+
+
+def read_status(store: BaseStore, namespace: tuple[str, ...]) -> Dict[str, Any] | None:
+    """Return the status mapping stored under STATUS_KEY, or None if no tool status is set.
+
+    Reads of the same namespace within _STATUS_CACHE_TTL of each other share one store read,
+    and status writes from this process are visible immediately.
+
+    Args:
+        store: LangGraph store instance
+        namespace: Namespace tuple for store isolation
+    """
+    namespace = namespace if type(namespace) is tuple else tuple(namespace)
+    now = time.monotonic()
+    with _status_cache_lock:
+        cached = _status_cache.get(namespace)
+        if cached is not None and now - cached[0] < _STATUS_CACHE_TTL:
+            _status_cache.move_to_end(namespace)
+            return cached[1]
+        writes = _status_writes
+    item = store.get(namespace, STATUS_KEY)
+    value = item.value if item else None
+    with _status_cache_lock:
+        if writes == _status_writes:
+            _status_cache[namespace] = (now, value)
+            _status_cache.move_to_end(namespace)
+            if len(_status_cache) > _STATUS_CACHE_MAXSIZE:
+                _status_cache.popitem(last=False)
+    return value
+
+
+def _flusher() -> None:
+    """Write pending status updates, coalescing bursts to the latest one per namespace."""
+    global _queued
+    while True:
+        with _pending_cond:
+            while not _pending:
+                _pending_cond.wait()
+            deadline = time.monotonic() + _MAX_BATCH_SECONDS
+            while True:
+                timeout = min(_QUIESCENCE_SECONDS, deadline - time.monotonic())
+                if timeout <= 0:
+                    break
+                seen = _queued
+                _pending_cond.wait(timeout)
+                if _queued == seen:
+                    break
+
+        with _write_lock:
+            with _pending_cond:
+                batch = list(_pending.values())
+                _pending.clear()
+                received, _queued = _queued, 0
+            for store, namespace, value in batch:
+                _store_write(store, namespace, value)
+        logger.debug("📝 write_status: flushed %d update(s) from %d queued", len(batch), received)
+
+
+def _ensure_flusher() -> None:
+    global _flusher_thread
+    if _flusher_thread is not None:
+        return
+    with _flusher_lock:
+        if _flusher_thread is None:
+            _flusher_thread = threading.Thread(target=_flusher, name="status-flusher", daemon=True)
+            _flusher_thread.start()
+
+
+def _write_now(store: BaseStore, namespace: tuple, value: ToolStatus | None) -> None:
+    """Write or delete the status synchronously, superseding any pending update for the namespace.
+
+    Callers store coordination keys such as `main_operation_complete` right after this returns,
+    so readers must never see those keys next to a stale "running" status.
+    """
+    with _write_lock:
+        with _pending_cond:
+            _pending.pop((id(store), namespace), None)
+        _store_write(store, namespace, value)
 
 
 def write_status(
@@ -9,62 +193,50 @@ def write_status(
     progress: int,
     status: str,
     store: BaseStore,
-    namespace: tuple | list,
-    config: Dict[str, Any] | None = None
+    namespace: tuple[str, ...],
+    config: Dict[str, Any] | None = None,
+    started_at: float | None = None,
+    duration: float | None = None,
 ) -> None:
-    """Write tool execution status and progress to the store.
-    
+    """Write a tool execution status and progress update to the store.
+
+    "running" updates are written by a background thread that coalesces bursts, so only
+    the latest one per namespace reaches the store. Any other status is final and is
+    written before this returns, replacing a "running" update that is still pending.
+
     Args:
         tool_name: Name of the tool being executed
         progress: Progress percentage (0-100)
         status: Status string ("running", "completed", "failed")
         store: LangGraph store instance
-        namespace: Namespace tuple for store isolation
+        namespace: Namespace tuple for store isolation. Callers should convert it once and
+            reuse the tuple; other sequences are converted on every call.
         config: Optional runtime config
+        started_at: Optional wall-clock start time (time.time()) of a running tool. Together with
+            `duration` it lets readers derive the progress, so no per-step updates are needed.
+        duration: Expected duration of the tool in seconds
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    if not isinstance(namespace, tuple):
-        try:
-            namespace = tuple(namespace)
-        except (TypeError, ValueError):
-            namespace = (str(namespace),)
-    
-    try:
-        logger.info(f"📝 write_status: Attempting to write to store: namespace={namespace}, key='working-tool-status-update'")
-        store.put(
-            namespace,
-            "working-tool-status-update",
-            {
-                "tool_name": tool_name,
-                "progress": progress,
-                "status": status,
-            }
-        )
-        logger.info(f"📝 write_status: Successfully called store.put() for {tool_name} at {progress}%")
-    except Exception as e:
-        logger.error(f"❌ write_status FAILED: {e}", exc_info=True)
-
-
-def reset_status(store: BaseStore, namespace: tuple | list) -> None:
+    global _queued
+    namespace = namespace if type(namespace) is tuple else tuple(namespace)
+    value = ToolStatus(tool_name, progress, status, started_at, duration)
+    if status != "running":
+        _write_now(store, namespace, value)
+        return
+    _ensure_flusher()
+    with _pending_cond:
+        _pending[(id(store), namespace)] = (store, namespace, value)
+        _queued += 1
+        _pending_cond.notify()
+
+
+def reset_status(store: BaseStore, namespace: tuple[str, ...]) -> None:
     """Reset/clear tool execution status from the store.
-    
+
+    Applied synchronously, replacing a "running" update that is still pending, so
+    coordination keys written after this call are never seen next to a stale status.
+
     Args:
         store: LangGraph store instance
         namespace: Namespace tuple for store isolation
     """
-    if not isinstance(namespace, tuple):
-        try:
-            namespace = tuple(namespace)
-        except (TypeError, ValueError):
-            namespace = (str(namespace),)
-    
-    try:
-        store.delete(namespace, "working-tool-status-update")
-    except Exception:
-        # If key doesn't exist, that's fine
-        pass
-
-
-
+    _write_now(store, namespace if type(namespace) is tuple else tuple(namespace), None)
@@ -11,13 +11,20 @@ Usage:
     python example_multi_thread.py
 """
 
+import asyncio
+import concurrent.futures
 import os
 import sys
-import time
 import uuid
 import threading
 import queue
 from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (not available on Windows)
+    uvloop = None
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -59,18 +66,35 @@ print(f"Namespace: {namespace_for_memory}")
 print("=" * 60)
 print()
 
-# Thread-safe printing
-print_lock = threading.Lock()
+# Thread-safe printing: callers only enqueue, a single printer thread writes to stdout.
+# Everything printed after this point goes through safe_print to keep the output ordered.
+_print_queue: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+
+def _printer() -> None:
+    while (text := _print_queue.get()) is not None:
+        print(text, flush=True)
+
+_printer_thread = threading.Thread(target=_printer, name="printer", daemon=True)
+_printer_thread.start()
 
-def safe_print(text: str) -> None:
-    with print_lock:
-        print(text)
+def safe_print(text: str = "") -> None:
+    _print_queue.put(text)
 
-def run_agent_stream(user_text: str, thread_type: str, config: dict, interim_reset: bool) -> None:
-    """Run agent and print results."""
+async def run_agent_stream_async(
+    user_text: str,
+    thread_type: str,
+    config: dict,
+    interim_reset: bool,
+    started: Optional[asyncio.Event] = None,
+) -> None:
+    """Run agent and print results.
+
+    If ``started`` is given, it is set on the first custom (progress) event so callers
+    can react as soon as a long-running operation is under way.
+    """
     messages = [HumanMessage(content=user_text)]
     try:
-        for mode, chunk in agent.stream(
+        async for mode, chunk in agent.astream(
             {
                 "messages": messages,
                 "thread_type": thread_type,
@@ -80,6 +104,8 @@ def run_agent_stream(user_text: str, thread_type: str, config: dict, interim_res
             config=config,
             store=store
         ):
+            if mode == "custom" and started is not None:
+                started.set()
             if isinstance(chunk, list) and chunk:
                 ai_messages = [m for m in chunk if isinstance(m, AIMessage)]
                 if ai_messages:
@@ -88,146 +114,136 @@ def run_agent_stream(user_text: str, thread_type: str, config: dict, interim_res
                 safe_print(f"[{thread_type}] {chunk}")
     except Exception as e:
         safe_print(f"[{thread_type} ERROR] {e!r}")
+    finally:
+        if started is not None:
+            # Never leave a waiter hanging if the run ends without emitting progress
+            started.set()
+
+
+# A single event loop (uvloop when available) runs every agent stream of the demo
+loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+threading.Thread(target=loop.run_forever, name="agent-event-loop", daemon=True).start()
+
+
+def submit(coro) -> "concurrent.futures.Future[Any]":
+    """Schedule a coroutine on the demo event loop."""
+    return asyncio.run_coroutine_threadsafe(coro, loop)
+
 
 # ============================================================================
 # Demo Scenario 1: Long operation with status checks
 # ============================================================================
 
-print("SCENARIO 1: Long operation with interim status checks")
-print("-" * 60)
+async def scenario_long_operation() -> None:
+    safe_print("SCENARIO 1: Long operation with interim status checks")
+    safe_print("-" * 60)
 
-# Start a long-running operation in the background
-print("\n>>> User: 'Change my package to Premium Plus'")
-print(">>> (Starting main thread in background...)")
-print()
+    # Start a long-running operation in the background
+    safe_print("\n>>> User: 'Change my package to Premium Plus'")
+    safe_print(">>> (Starting main thread in background...)")
+    safe_print()
 
-main_job = threading.Thread(
-    target=run_agent_stream,
-    args=("Change my package to Premium Plus", "main", config_main, True),
-    daemon=True
-)
-main_job.start()
+    started = asyncio.Event()
+    main_task = asyncio.create_task(
+        run_agent_stream_async("Change my package to Premium Plus", "main", config_main, True, started)
+    )
 
-# Wait a bit for the operation to start
-time.sleep(3)
+    # Ask the follow-up questions as soon as the operation reports progress
+    started_wait = asyncio.create_task(started.wait())
+    await asyncio.wait({main_task, started_wait}, return_when=asyncio.FIRST_COMPLETED)
+    started_wait.cancel()
 
-# Now user asks about status (secondary thread)
-print("\n>>> User: 'What's the status of my request?'")
-print(">>> (Handled by secondary thread...)")
-print()
-run_agent_stream("What's the status of my request?", "secondary", config_secondary, False)
+    # Now user asks about status (secondary thread)
+    safe_print("\n>>> User: 'What's the status of my request?'")
+    safe_print(">>> (Handled by secondary thread...)")
+    safe_print()
+    await run_agent_stream_async("What's the status of my request?", "secondary", config_secondary, False)
 
-# Another query while main is still running
-time.sleep(2)
-print("\n>>> User: 'How much data do I have left?'")
-print(">>> (Handled by secondary thread...)")
-print()
-run_agent_stream("How much data do I have left?", "secondary", config_secondary, False)
+    # Another query while main is still running
+    safe_print("\n>>> User: 'How much data do I have left?'")
+    safe_print(">>> (Handled by secondary thread...)")
+    safe_print()
+    await run_agent_stream_async("How much data do I have left?", "secondary", config_secondary, False)
 
-# Wait for main operation to complete
-main_job.join()
+    # Wait for main operation to complete
+    await main_task
+
+    safe_print("\n" + "=" * 60)
+    safe_print("Main operation completed and synthesized with interim conversation!")
+    safe_print("=" * 60)
 
-print("\n" + "=" * 60)
-print("Main operation completed and synthesized with interim conversation!")
-print("=" * 60)
+
+submit(scenario_long_operation()).result()
 
 # ============================================================================
 # Demo Scenario 2: Quick query (no multi-threading needed)
 # ============================================================================
 
-print("\n\nSCENARIO 2: Quick query (synchronous)")
-print("-" * 60)
+safe_print("\n\nSCENARIO 2: Quick query (synchronous)")
+safe_print("-" * 60)
 
-print("\n>>> User: 'What's my current package?'")
-print(">>> (Quick query, handled synchronously...)")
-print()
-run_agent_stream("What's my current package?", "main", config_main, True)
+safe_print("\n>>> User: 'What's my current package?'")
+safe_print(">>> (Quick query, handled synchronously...)")
+safe_print()
+submit(run_agent_stream_async("What's my current package?", "main", config_main, True)).result()
 
 # ============================================================================
 # Demo Scenario 3: Interactive mode
 # ============================================================================
 
-print("\n\nSCENARIO 3: Interactive mode")
-print("-" * 60)
-print("Type your messages. Long operations will run in background.")
-print("Type 'exit' to quit.")
-print("-" * 60)
+safe_print("\n\nSCENARIO 3: Interactive mode")
+safe_print("-" * 60)
+safe_print("Type your messages. Long operations will run in background.")
+safe_print("Type 'exit' to quit.")
+safe_print("-" * 60)
 
-input_queue: "queue.Queue[str]" = queue.Queue()
-stop_event = threading.Event()
-main_job_active = None
+_EXIT_WORDS = frozenset({"exit", "quit"})
+main_job_active: "concurrent.futures.Future[Any] | None" = None
 interim_reset = True
 
-def input_reader() -> None:
-    try:
-        while not stop_event.is_set():
-            try:
-                user_text = input("\nYou: ").strip()
-            except (KeyboardInterrupt, EOFError):
-                user_text = "exit"
-            if not user_text:
-                continue
-            input_queue.put(user_text)
-            if user_text.lower() in {"exit", "quit"}:
-                break
-    finally:
-        pass
-
-reader_thread = threading.Thread(target=input_reader, daemon=True)
-reader_thread.start()
-
+# stdin is read on this thread: secondary turns run synchronously and main turns are handed to the
+# event loop, so nothing else needs to happen while waiting for input. Lines typed during a
+# secondary turn stay buffered by the terminal until the next prompt.
 try:
     while True:
         try:
-            user_text = input_queue.get(timeout=0.1)
-        except queue.Empty:
-            continue
-
+            user_text = input("\nYou: ").strip()
+        except (KeyboardInterrupt, EOFError):
+            break
         if not user_text:
             continue
-
-        if user_text.lower() in {"exit", "quit"}:
-            stop_event.set()
+        if user_text.lower() in _EXIT_WORDS:
             break
 
         # Check if main thread is active
-        main_active = main_job_active is not None and main_job_active.is_alive()
+        main_active = main_job_active is not None and not main_job_active.done()
         
-        # Check store for running status
-        memories = store.search(namespace_for_memory)
-        current_status = None
-        if memories:
-            try:
-                md = list(memories)[-1].value
-                current_status = md.get("status")
-            except Exception:
-                pass
+        # Check store for running status (one key lookup instead of searching the namespace)
+        status_item = store.get(namespace_for_memory, "working-tool-status-update")
+        current_status = status_item.value.get("status") if status_item else None
 
         if current_status == "running" or main_active:
             # Secondary thread (synchronous)
             safe_print("\n>>> (Long operation in progress, using secondary thread...)")
-            run_agent_stream(user_text, "secondary", config_secondary, False)
+            submit(run_agent_stream_async(user_text, "secondary", config_secondary, False)).result()
             interim_reset = False
         else:
             # Main thread (background)
             safe_print("\n>>> (Starting operation in background...)")
             interim_reset = True
-            t = threading.Thread(
-                target=run_agent_stream,
-                args=(user_text, "main", config_main, interim_reset),
-                daemon=True
-            )
-            main_job_active = t
-            t.start()
+            main_job_active = submit(run_agent_stream_async(user_text, "main", config_main, interim_reset))
 
 except Exception as e:
     safe_print(f"\n[FATAL ERROR] {e!r}")
-finally:
-    stop_event.set()
-    if main_job_active is not None:
-        main_job_active.join(timeout=5)
 
-print("\n\nDemo completed!")
+# No join on exit: the event loop runs on a daemon thread, so an operation
+# still in flight is abandoned instead of stalling shutdown
+if main_job_active is not None and not main_job_active.done():
+    safe_print(">>> (Abandoning background operation still in progress)")
+
+safe_print("\n\nDemo completed!")
+_print_queue.put(None)
+_printer_thread.join(timeout=5)
 
 
 
@@ -1,8 +1,11 @@
+import concurrent.futures
+import functools
 import os
 import json
 import logging
+import re
+import threading
 import time
-from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -18,7 +21,7 @@ from langchain_core.messages import (
     ToolMessage,
 )
 from langchain_core.prompts import ChatPromptTemplate
-from langgraph.store.base import BaseStore
+from langgraph.store.base import BaseStore, GetOp, PutOp
 from langgraph.config import RunnableConfig
 from langchain_core.runnables.config import ensure_config
 from langgraph.config import get_store
@@ -57,13 +60,18 @@ check_status = telco_tools.check_status
 try:
     from ..helper_functions import write_status, reset_status
 except Exception:
+    import sys as _sys
     import importlib.util as _ilu
-    _dir = os.path.dirname(os.path.dirname(__file__))
-    _helper_path = os.path.join(_dir, "helper_functions.py")
-    _spec = _ilu.spec_from_file_location("helper_functions", _helper_path)
-    _helper_module = _ilu.module_from_spec(_spec)  # type: ignore
-    assert _spec and _spec.loader
-    _spec.loader.exec_module(_helper_module)  # type: ignore
+    # Share one module instance with tools so status writes go through a single queue
+    _helper_module = _sys.modules.get("helper_functions")
+    if _helper_module is None:
+        _dir = os.path.dirname(os.path.dirname(__file__))
+        _helper_path = os.path.join(_dir, "helper_functions.py")
+        _spec = _ilu.spec_from_file_location("helper_functions", _helper_path)
+        _helper_module = _ilu.module_from_spec(_spec)  # type: ignore
+        assert _spec and _spec.loader
+        _sys.modules["helper_functions"] = _helper_module
+        _spec.loader.exec_module(_helper_module)  # type: ignore
     write_status = _helper_module.write_status
     reset_status = _helper_module.reset_status
 
@@ -96,6 +104,10 @@ SECONDARY_SYSTEM_PROMPT = (
 )
 
 
+# System messages are immutable, build them once instead of on every LLM turn
+_MAIN_SYS_MSGS: List[BaseMessage] = [SystemMessage(content=SYSTEM_PROMPT)]
+_SECONDARY_SYS_MSGS: List[BaseMessage] = [SystemMessage(content=SECONDARY_SYSTEM_PROMPT)]
+
 _MODEL_NAME = os.getenv("REACT_MODEL", os.getenv("CLARIFY_MODEL", "gpt-4o"))
 _LLM = ChatOpenAI(model=_MODEL_NAME, temperature=0.3)
 _HELPER_LLM = ChatOpenAI(model=_MODEL_NAME, temperature=0.7)
@@ -130,7 +142,9 @@ _SECONDARY_TOOLS = [
 _LLM_WITH_TOOLS = _LLM.bind_tools(_MAIN_TOOLS)
 _HELPER_LLM_WITH_TOOLS = _HELPER_LLM.bind_tools(_SECONDARY_TOOLS)
 _ALL_TOOLS_BY_NAME = {t.name: t for t in (_MAIN_TOOLS + [check_status])}
-
+_LOGIN_TOOL_NAMES = frozenset({"start_login_tool", "verify_login_tool"})
+# Per tool name: (tool, bound invoke, is a login tool), computed once instead of on every call
+_TOOL_META = {name: (t, t.invoke, name in _LOGIN_TOOL_NAMES) for name, t in _ALL_TOOLS_BY_NAME.items()}
 # Synthesis chain for merging tool results with interim conversation
 _SYNTHESIS_PROMPT = ChatPromptTemplate.from_messages(
     [
@@ -152,11 +166,36 @@ _SYNTHESIS_PROMPT = ChatPromptTemplate.from_messages(
 _SYNTHESIS_LLM = ChatOpenAI(model=_MODEL_NAME, temperature=0.7)
 _SYNTHESIS_CHAIN = _SYNTHESIS_PROMPT | _SYNTHESIS_LLM
 
+# Interim messages mentioning any of these are status chatter and are left out of the synthesis
+_STATUS_RE = re.compile(r"processing|complete|running|percent|status", re.IGNORECASE)
+_MAX_INTERIM_CONTENT_CHARS = 2000
+
+# Signaled by a secondary run when it releases its processing lock, keyed by namespace. Lets the main
+# run wait for a secondary running in the same process without polling the store.
+_SECONDARY_DONE_EVENTS: Dict[tuple, threading.Event] = {}
+
 # Simple per-run context storage (thread-safe enough for local dev worker)
 _CURRENT_THREAD_ID: str | None = None
 _CURRENT_MSISDN: str | None = None
 
 # ---- Logger ----
+class _Truncated:
+    """Log argument that cuts long text (LLM output, tool payloads) only when a record is formatted.
+
+    Truncating the argument rather than in a formatter keeps the full text out of every handler,
+    including the root and LangGraph handlers the records propagate to.
+    """
+
+    __slots__ = ("text", "limit")
+
+    def __init__(self, text: str, limit: int):
+        self.text = text
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return self.text if len(self.text) <= self.limit else self.text[: self.limit] + "…"
+
+
 logger = logging.getLogger("TelcoAgent")
 if not logger.handlers:
     _stream = logging.StreamHandler()
@@ -173,21 +212,36 @@ if not logger.handlers:
         pass
 logger.setLevel(logging.INFO)
 _DEBUG = os.getenv("TELCO_DEBUG", "0") not in ("", "0", "false", "False")
+# Maximum number of conversation messages sent to the LLM
+_MAX_MESSAGES = int(os.getenv("RBC_FEES_MAX_MSGS", "40"))
+# Old messages are evicted in blocks of this size rather than one per turn. The start of the window
+# then stays put for several turns, so the request prefix (system prompt, tools, early history) is
+# unchanged and the provider's automatic prompt cache keeps hitting.
+_TRIM_STEP = max(1, min(10, _MAX_MESSAGES // 4))
+
+def _safe_get(container: Any, key: str, default: Any = None) -> Any:
+    """Dict-like or attribute-like access that never raises."""
+    try:
+        if isinstance(container, dict):
+            return container.get(key, default)
+        if hasattr(container, "get"):
+            return container.get(key, default)
+        if hasattr(container, key):
+            return getattr(container, key, default)
+    except Exception:
+        return default
+    return default
+
 
 def _get_thread_id(config: Dict[str, Any] | None, messages: List[BaseMessage]) -> str:
     cfg = config or {}
-    # Try dict-like and attribute-like access
-    def _safe_get(container: Any, key: str, default: Any = None) -> Any:
-        try:
-            if isinstance(container, dict):
-                return container.get(key, default)
-            if hasattr(container, "get"):
-                return container.get(key, default)
-            if hasattr(container, key):
-                return getattr(container, key, default)
-        except Exception:
-            return default
-        return default
+    # Fast path: LangGraph always passes a plain dict config with the thread_id
+    if isinstance(cfg, dict):
+        conf = cfg.get("configurable")
+        if isinstance(conf, dict):
+            val = conf.get("thread_id")
+            if isinstance(val, str) and val:
+                return val
 
     try:
         conf = _safe_get(cfg, "configurable", {}) or {}
@@ -213,12 +267,6 @@ def _get_thread_id(config: Dict[str, Any] | None, messages: List[BaseMessage]) -
     return "unknown"
 
 
-def _trim_messages(messages: List[BaseMessage], max_messages: int = 40) -> List[BaseMessage]:
-    if len(messages) <= max_messages:
-        return messages
-    return messages[-max_messages:]
-
-
 def _sanitize_conversation(messages: List[BaseMessage]) -> List[BaseMessage]:
     """Ensure tool messages only follow an assistant message with tool_calls.
 
@@ -256,26 +304,47 @@ def _sanitize_conversation(messages: List[BaseMessage]) -> List[BaseMessage]:
             # On any unexpected shape, include as-is but reset to avoid pairing issues
             sanitized.append(m)
             pending_tool_ids = None
-    # Ensure the conversation doesn't start with a ToolMessage
-    while sanitized and isinstance(sanitized[0], ToolMessage):
-        sanitized.pop(0)
-    return sanitized
+    return _drop_leading_tool_messages(sanitized)
 
 
-def _today_string() -> str:
-    override = os.getenv("RBC_FEES_TODAY_OVERRIDE")
-    if isinstance(override, str) and override.strip():
-        try:
-            datetime.strptime(override.strip(), "%Y-%m-%d")
-            return override.strip()
-        except Exception:
-            pass
-    return datetime.utcnow().strftime("%Y-%m-%d")
+def _drop_leading_tool_messages(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """Ensure the conversation doesn't start with a ToolMessage."""
+    start = 0
+    while start < len(messages) and isinstance(messages[start], ToolMessage):
+        start += 1
+    return messages[start:] if start else messages
+
+
+def _meaningful_interim_messages(interim_conv: List[Any] | None) -> List[Any]:
+    """Return the interim messages worth synthesizing, dropping status chatter and tool payloads."""
+    meaningful_messages = []
+    for m in interim_conv or []:
+        content = getattr(m, 'content', None)
+        # Skip non-text and oversized content (tool payloads) without scanning it
+        if not isinstance(content, str) or len(content) > _MAX_INTERIM_CONTENT_CHARS:
+            continue
+        # Skip if it's just about status/progress
+        if not _STATUS_RE.search(content):
+            meaningful_messages.append(m)
+    return meaningful_messages
+
+
+def _interim_conversation_str(meaningful_messages: List[Any]) -> str:
+    return "\n".join(
+        [f"{getattr(m, 'type', 'message')}: {getattr(m, 'content', '')}" for m in meaningful_messages]
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _synthesize(tool_result: str, interim_conversation: str) -> AIMessage:
+    """Merge an operation result with the interim conversation. Identical inputs reuse the previous answer."""
+    return _SYNTHESIS_CHAIN.invoke({"tool_result": tool_result, "interim_conversation": interim_conversation})
 
 
-def _system_messages() -> List[BaseMessage]:
-    today = _today_string()
-    return [SystemMessage(content=SYSTEM_PROMPT)]
+@task()
+def synthesize_speculatively(tool_result: str, interim_conversation: str) -> AIMessage:
+    """Run the synthesis on the runtime's executor while the main thread waits for the secondary."""
+    return _synthesize(tool_result, interim_conversation)
 
 
 @task()
@@ -287,34 +356,32 @@ def call_llm(messages: List[BaseMessage]) -> AIMessage:
             logger.info("call_llm: messages_count=%s preview=%s", len(messages), preview)
         except Exception:
             logger.info("call_llm: messages_count=%s", len(messages))
-    resp = _LLM_WITH_TOOLS.invoke(_system_messages() + messages)
-    try:
-        # Log assistant content or tool calls for visibility
-        tool_calls = getattr(resp, "tool_calls", None) or []
-        if tool_calls:
-            names = []
-            for tc in tool_calls:
-                n = tc.get("name") if isinstance(tc, dict) else getattr(tc, "name", None)
-                if isinstance(n, str):
-                    names.append(n)
-            logger.info("LLM tool_calls: %s", names)
-        else:
-            txt = getattr(resp, "content", "") or ""
-            if isinstance(txt, str) and txt.strip():
-                logger.info("LLM content: %s", (txt if len(txt) <= 500 else (txt[:500] + "…")))
-    except Exception:
-        pass
+    resp = _LLM_WITH_TOOLS.invoke(_MAIN_SYS_MSGS + messages)
+    if logger.isEnabledFor(logging.INFO):
+        try:
+            # Log assistant content or tool calls for visibility
+            tool_calls = getattr(resp, "tool_calls", None) or []
+            if tool_calls:
+                # LangChain tool calls are ToolCall dicts
+                logger.info("LLM tool_calls: %s", [tc.get("name") for tc in tool_calls])
+            else:
+                txt = getattr(resp, "content", "") or ""
+                if isinstance(txt, str) and txt.strip():
+                    logger.info("LLM content: %s", _Truncated(txt, 500))
+        except Exception:
+            pass
     return resp
 
 
 @task()
-def call_tool(tool_call: ToolCall) -> ToolMessage:
+def call_tool(tool_call: ToolCall, _meta: Dict[str, tuple] = _TOOL_META) -> ToolMessage:
     """Execute a tool call and wrap result in a ToolMessage."""
     global _CURRENT_MSISDN
-    tool = _ALL_TOOLS_BY_NAME[tool_call["name"]]
+    # The tool registry is bound as a default argument so the lookup is a local, not a global
+    tool, invoke, is_login_tool = _meta[tool_call["name"]]
     args = tool_call.get("args") or {}
     # Auto-inject session context and remembered msisdn
-    if tool.name in ("start_login_tool", "verify_login_tool"):
+    if is_login_tool:
         if "session_id" not in args and _CURRENT_THREAD_ID:
             args["session_id"] = _CURRENT_THREAD_ID
     if "msisdn" not in args and _CURRENT_MSISDN:
@@ -330,37 +397,37 @@ def call_tool(tool_call: ToolCall) -> ToolMessage:
             logger.info("call_tool: name=%s args_keys=%s", tool.name, list(args.keys()))
         except Exception:
             logger.info("call_tool: name=%s", tool.name)
-    result = tool.invoke(args)
+    result = invoke(args)
     # Ensure string content
     content = result if isinstance(result, str) else json.dumps(result)
+    # Parse the login tools' JSON result once for logging and scrubbing
+    data: Any = None
+    if is_login_tool:
+        try:
+            data = json.loads(content)
+        except Exception:
+            data = None
     try:
         # Log tool result previews and OTP debug_code when present
         if tool.name == "verify_login_tool":
-            try:
-                data = json.loads(content)
+            if isinstance(data, dict):
                 logger.info("verify_login: verified=%s", data.get("verified"))
-            except Exception:
-                logger.info("verify_login result: %s", content[:300])
+            else:
+                logger.info("verify_login result: %s", _Truncated(content, 300))
         elif tool.name == "start_login_tool":
-            try:
-                data = json.loads(content)
+            if isinstance(data, dict):
                 logger.info("start_login_tool: sent=%s", data.get("sent"))
-            except Exception:
-                logger.info("start_login_tool: %s", content[:300])
+            else:
+                logger.info("start_login_tool: %s", _Truncated(content, 300))
         else:
             # Generic preview
-            logger.info("tool %s result: %s", tool.name, (content[:300] if isinstance(content, str) else str(content)[:300]))
-    except Exception:
-        pass
-    # Never expose OTP debug_code to the LLM
-    try:
-        if tool.name == "start_login_tool":
-            data = json.loads(content)
-            if isinstance(data, dict) and "debug_code" in data:
-                data.pop("debug_code", None)
-                content = json.dumps(data)
+            logger.info("tool %s result: %s", tool.name, _Truncated(content, 300))
     except Exception:
         pass
+    # Never expose OTP debug_code to the LLM; re-serialize only when something was removed
+    if tool.name == "start_login_tool" and isinstance(data, dict) and "debug_code" in data:
+        data.pop("debug_code", None)
+        content = json.dumps(data)
     return ToolMessage(content=content, tool_call_id=tool_call["id"], name=tool.name)
 
 
@@ -413,12 +480,20 @@ def agent(input_dict: dict, previous: Any = None, config: RunnableConfig | None
             previous_messages = list(previous) if isinstance(previous, list) else []
             previous_interim_messages = []
         
-        messages = add_messages(previous_messages, messages)
+        # The saved history was sanitized on the turn that produced it and only ever gets complete
+        # assistant/tool groups appended, so only the new messages need the full pass
+        messages = add_messages(previous_messages, _sanitize_conversation(messages))
         interim_messages = add_messages(messages, previous_interim_messages)
+    else:
+        messages = _sanitize_conversation(messages)
     
-    # Trim and sanitize
-    messages = _trim_messages(messages, max_messages=int(os.getenv("RBC_FEES_MAX_MSGS", "40")))
-    messages = _sanitize_conversation(messages)
+    # Trim. Trimming happens once, before the tool loop: evicting messages while tools
+    # run could separate an assistant tool call from its results.
+    if len(messages) > _MAX_MESSAGES:
+        # Drop the excess rounded up to a whole number of blocks
+        drop = -(-(len(messages) - _MAX_MESSAGES) // _TRIM_STEP) * _TRIM_STEP
+        # Trimming only cuts the head, so the only orphans it can leave are leading tool messages
+        messages = _drop_leading_tool_messages(messages[drop:])
     
     # Get thread ID and session context
     thread_id = _get_thread_id(cfg, messages)
@@ -431,107 +506,154 @@ def agent(input_dict: dict, previous: Any = None, config: RunnableConfig | None
     
     logger.info("agent start: thread_id=%s thread_type=%s total_in=%s", thread_id, thread_type, len(messages))
     
-    # Secondary thread: Set processing lock at start
-    if thread_type != "main" and namespace:
-        store.put(namespace, "secondary_status", {
-            "processing": True,
-            "started_at": time.time()
-        })
+    secondary_done: threading.Event | None = None
+    try:
+        # Secondary thread: Set processing lock at start
+        if thread_type != "main" and namespace:
+            # Register the event before the lock is visible so a waiting main run always finds it
+            secondary_done = _SECONDARY_DONE_EVENTS[namespace] = threading.Event()
+            store.put(namespace, "secondary_status", {
+                "processing": True,
+                "started_at": time.time()
+            })
         
-        # Check abort flag before starting
-        abort_signal = store.get(namespace, "secondary_abort")
-        if abort_signal and abort_signal.value.get("abort"):
-            # Clean up and exit silently
-            store.put(namespace, "secondary_status", {"processing": False, "aborted": True})
-            store.delete(namespace, "secondary_abort")
-            prev_state = previous if isinstance(previous, dict) else {"messages": [], "interim_messages": []}
-            return entrypoint.final(value=[], save=prev_state)
-    
-    # Choose LLM and system prompt based on thread type
-    if thread_type == "main":
-        active_llm_with_tools = _LLM_WITH_TOOLS
-        system_prompt = SYSTEM_PROMPT
-    else:
-        active_llm_with_tools = _HELPER_LLM_WITH_TOOLS
-        system_prompt = SECONDARY_SYSTEM_PROMPT
+            # Check abort flag before starting
+            abort_signal = store.get(namespace, "secondary_abort")
+            if abort_signal and abort_signal.value.get("abort"):
+                # Clean up and exit silently
+                store.batch([
+                    PutOp(namespace, "secondary_status", {"processing": False, "aborted": True}),
+                    PutOp(namespace, "secondary_abort", None),
+                ])
+                prev_state = previous if isinstance(previous, dict) else {"messages": [], "interim_messages": []}
+                return entrypoint.final(value=[], save=prev_state)
     
-    # Build system messages
-    sys_messages = [SystemMessage(content=system_prompt)]
+        # Choose LLM and system messages based on thread type
+        if thread_type == "main":
+            active_llm_with_tools = _LLM_WITH_TOOLS
+            sys_messages = _MAIN_SYS_MSGS
+        else:
+            active_llm_with_tools = _HELPER_LLM_WITH_TOOLS
+            sys_messages = _SECONDARY_SYS_MSGS
     
-    # First LLM call
-    llm_response = active_llm_with_tools.invoke(sys_messages + messages)
+        # First LLM call
+        llm_response = active_llm_with_tools.invoke(sys_messages + messages)
     
-    # Tool execution loop
-    while True:
-        tool_calls = getattr(llm_response, "tool_calls", None) or []
-        if not tool_calls:
-            break
+        # Tool execution loop
+        while True:
+            tool_calls = getattr(llm_response, "tool_calls", None) or []
+            if not tool_calls:
+                break
         
-        # Execute tools in parallel
-        futures = [call_tool(tc) for tc in tool_calls]
-        tool_results = [f.result() for f in futures]
+            # Execute tools in parallel
+            futures = [call_tool(tc) for tc in tool_calls]
+            tool_results = [f.result() for f in futures]
         
-        if _DEBUG:
-            try:
-                logger.info("tool_results: count=%s names=%s", len(tool_results), [tr.name for tr in tool_results])
-            except Exception:
-                pass
+            if _DEBUG:
+                try:
+                    logger.info("tool_results: count=%s names=%s", len(tool_results), [tr.name for tr in tool_results])
+                except Exception:
+                    pass
         
-        messages = add_messages(messages, [llm_response, *tool_results])
-        llm_response = active_llm_with_tools.invoke(sys_messages + messages)
+            # `messages` is a fresh list built for this run, so extend it in place instead of
+            # rebuilding it with add_messages on every turn (new turns never replace existing ids)
+            messages.append(llm_response)
+            messages.extend(tool_results)
+            llm_response = active_llm_with_tools.invoke(sys_messages + messages)
     
-    # Append final assistant turn
-    messages = add_messages(messages, [llm_response])
+        # Append final assistant turn
+        messages.append(llm_response)
     
-    # Update interim messages
-    if interim_messages_reset:
-        interim_messages = add_messages([], [llm_response])
-    else:
-        interim_messages = add_messages(interim_messages, [llm_response])
+        # Update interim messages
+        if interim_messages_reset:
+            interim_messages = add_messages([], [llm_response])
+        else:
+            interim_messages = add_messages(interim_messages, [llm_response])
     
-    # Main thread: Reset status after completion and signal completion
-    if thread_type == "main" and namespace:
-        reset_status(store, namespace)
-        # Signal that main operation is complete
-        store.put(namespace, "main_operation_complete", {
-            "completed": True,
-            "timestamp": time.time()
-        })
+        # Main thread: Reset status after completion and signal completion
+        if thread_type == "main" and namespace:
+            reset_status(store, namespace)
+            # Signal that main operation is complete
+            store.put(namespace, "main_operation_complete", {
+                "completed": True,
+                "timestamp": time.time()
+            })
     
-    # Secondary thread: Handle abort and release lock
-    if thread_type != "main" and namespace:
-        # Check abort flag before writing results
-        abort_signal = store.get(namespace, "secondary_abort")
-        if abort_signal and abort_signal.value.get("abort"):
-            # Clean up and exit without saving
-            store.put(namespace, "secondary_status", {"processing": False, "aborted": True})
-            store.delete(namespace, "secondary_abort")
-            prev_state = previous if isinstance(previous, dict) else {"messages": [], "interim_messages": []}
-            return entrypoint.final(value=[], save=prev_state)
+        # Secondary thread: Handle abort and release lock
+        if thread_type != "main" and namespace:
+            # Check abort flag before writing results
+            abort_signal = store.get(namespace, "secondary_abort")
+            if abort_signal and abort_signal.value.get("abort"):
+                # Clean up and exit without saving
+                store.batch([
+                    PutOp(namespace, "secondary_status", {"processing": False, "aborted": True}),
+                    PutOp(namespace, "secondary_abort", None),
+                ])
+                prev_state = previous if isinstance(previous, dict) else {"messages": [], "interim_messages": []}
+                return entrypoint.final(value=[], save=prev_state)
         
-        # Safe to proceed - write results and release lock
-        store.put(namespace, "secondary_interim_messages", {"messages": interim_messages})
-        store.put(namespace, "secondary_status", {
-            "processing": False,
-            "completed_at": time.time()
-        })
+            # Safe to proceed - write results and release lock
+            store.batch([
+                PutOp(namespace, "secondary_interim_messages", {"messages": interim_messages}),
+                PutOp(namespace, "secondary_status", {"processing": False, "completed_at": time.time()}),
+            ])
+    finally:
+        # Runs on every exit, including a failed secondary run, so a waiting main run never hangs
+        # and the per-namespace entry does not outlive the run
+        if secondary_done is not None:
+            if _SECONDARY_DONE_EVENTS.get(namespace) is secondary_done:
+                del _SECONDARY_DONE_EVENTS[namespace]
+            secondary_done.set()
     
     # Main thread: Wait for secondary and synthesize if needed
     if thread_type == "main" and namespace:
         # Wait for secondary thread to finish processing (with timeout)
         MAX_WAIT_SECONDS = 15
         CHECK_INTERVAL = 0.5
-        elapsed = 0
-        
-        while elapsed < MAX_WAIT_SECONDS:
-            secondary_status = store.get(namespace, "secondary_status")
-            if not secondary_status or not secondary_status.value.get("processing", False):
-                break
-            time.sleep(CHECK_INTERVAL)
-            elapsed += CHECK_INTERVAL
+        tool_result_content = messages[-1].content if messages else ""
+        if not isinstance(tool_result_content, str):
+            # Content blocks are not hashable; the synthesis cache is keyed on strings
+            tool_result_content = str(tool_result_content)
+
+        def _secondary_processing(secondary_status=None) -> bool:
+            if secondary_status is None:
+                secondary_status = store.get(namespace, "secondary_status")
+            return bool(secondary_status and secondary_status.value.get("processing", False))
+
+        timed_out = False
+        speculative_synthesis: tuple[str, "concurrent.futures.Future[AIMessage]"] | None = None
+        # Lock and posted interim conversation are read in a single store round trip
+        secondary_status, posted = store.batch([
+            GetOp(namespace, "secondary_status"),
+            GetOp(namespace, "secondary_interim_messages"),
+        ])
+        if _secondary_processing(secondary_status):
+            # Synthesize over the interim conversation posted so far while waiting. If the in-flight
+            # secondary turn adds nothing meaningful (e.g. a status check), this result is used as is.
+            posted_str = _interim_conversation_str(
+                _meaningful_interim_messages(posted.value.get("messages") if posted else None)
+            )
+            if posted_str:
+                speculative_synthesis = (
+                    posted_str,
+                    synthesize_speculatively(tool_result_content, posted_str),
+                )
+
+            secondary_done = _SECONDARY_DONE_EVENTS.get(namespace)
+            if secondary_done is not None:
+                # Secondary runs in this process: wake up as soon as it releases the lock
+                timed_out = not secondary_done.wait(MAX_WAIT_SECONDS)
+            else:
+                # Secondary runs in another worker: fall back to polling the store
+                deadline = time.monotonic() + MAX_WAIT_SECONDS
+                while _secondary_processing():
+                    if time.monotonic() >= deadline:
+                        timed_out = True
+                        break
+                    time.sleep(CHECK_INTERVAL)
         
         # If timed out, set abort flag
-        if elapsed >= MAX_WAIT_SECONDS:
+        if timed_out:
             store.put(namespace, "secondary_abort", {
                 "abort": True,
                 "reason": "main_thread_timeout",
@@ -545,24 +667,16 @@ def agent(input_dict: dict, previous: Any = None, config: RunnableConfig | None
             interim_conv = interim_messages_from_store.value.get("messages")
             if interim_conv and len(interim_conv) > 0:
                 # Filter out status-only messages for synthesis
-                meaningful_messages = []
-                for m in interim_conv:
-                    content = getattr(m, 'content', '').lower()
-                    # Skip if it's just about status/progress
-                    if not any(word in content for word in ['processing', 'complete', 'running', 'percent', 'status']):
-                        meaningful_messages.append(m)
+                meaningful_messages = _meaningful_interim_messages(interim_conv)
                 
                 # Only synthesize if there were non-status conversations
                 if meaningful_messages:
-                    tool_result_content = messages[-1].content if messages else ""
-                    interim_conv_str = "\n".join(
-                        [f"{getattr(m, 'type', 'message')}: {getattr(m, 'content', '')}" for m in meaningful_messages]
-                    )
+                    interim_conv_str = _interim_conversation_str(meaningful_messages)
                     try:
-                        final_answer = _SYNTHESIS_CHAIN.invoke({
-                            "tool_result": tool_result_content,
-                            "interim_conversation": interim_conv_str,
-                        })
+                        if speculative_synthesis is not None and speculative_synthesis[0] == interim_conv_str:
+                            final_answer = speculative_synthesis[1].result()
+                        else:
+                            final_answer = _synthesize(tool_result_content, interim_conv_str)
                         # Add visual marker for synthesis
                         synthesized_content = f"{final_answer.content}"
                         messages[-1] = AIMessage(content=synthesized_content)
@@ -576,14 +690,16 @@ def agent(input_dict: dict, previous: Any = None, config: RunnableConfig | None
         
         # Clean up coordination state
         reset_status(store, namespace)
-        store.delete(namespace, "secondary_status")
-        store.delete(namespace, "secondary_abort")
-        # Keep completion flag briefly for client to see
-        store.put(namespace, "main_operation_complete", {
-            "completed": True,
-            "timestamp": time.time(),
-            "ready_for_new_operation": True
-        })
+        store.batch([
+            PutOp(namespace, "secondary_status", None),
+            PutOp(namespace, "secondary_abort", None),
+            # Keep completion flag briefly for client to see
+            PutOp(namespace, "main_operation_complete", {
+                "completed": True,
+                "timestamp": time.time(),
+                "ready_for_new_operation": True
+            }),
+        ])
     
     # Prepare final state
     current_state = {
@@ -594,7 +710,7 @@ def agent(input_dict: dict, previous: Any = None, config: RunnableConfig | None
     final_text = getattr(messages[-1], "content", "") if messages else ""
     try:
         if isinstance(final_text, str) and final_text.strip():
-            logger.info("final content: %s", (final_text if len(final_text) <= 500 else (final_text[:500] + "…")))
+            logger.info("final content: %s", _Truncated(final_text, 500))
     except Exception:
         pass
     
@@ -19,17 +19,19 @@ Usage:
 
 import argparse
 import asyncio
+import os
 import sys
 import time
 import uuid
 from pathlib import Path
 import contextlib
-
-from langgraph_sdk import get_client
-from langgraph_sdk.schema import StreamPart
-import httpx
 from typing import Any, Optional
 
+from helper_functions import current_progress
+
+# langgraph_sdk and httpx are imported where they are first used, so `--help` and argument
+# errors do not pay for loading them
+
 
 # Terminal colors
 RESET = "\033[0m"
@@ -42,6 +44,14 @@ FG_YELLOW = "\033[33m"
 FG_MAGENTA = "\033[35m"
 FG_GRAY = "\033[90m"
 PROMPT_STR = f"{BOLD}> {RESET}"
+EXIT_COMMANDS = frozenset({"exit", "quit", "/exit"})
+
+
+# Return to column 0 and clear the line, so output does not mix with the prompt being typed
+_CLEAR_LINE = "\r\x1b[2K"
+_LINE_END_WITH_PROMPT = "\n" + PROMPT_STR
+_USER_PREFIX = f"{FG_BLUE}User{RESET}: "
+_ASSISTANT_PREFIX = f"{FG_GREEN}Assistant{RESET}: "
 
 
 def _show_prompt() -> None:
@@ -50,13 +60,13 @@ def _show_prompt() -> None:
 
 
 def _write_line(s: str) -> None:
-    sys.stdout.write("\r\x1b[2K" + s + "\n")
+    # Line and prompt go out in one write and one flush
+    sys.stdout.write(_CLEAR_LINE + s + _LINE_END_WITH_PROMPT)
     sys.stdout.flush()
-    _show_prompt()
 
 
 def _write_line_no_prompt(s: str) -> None:
-    sys.stdout.write("\r\x1b[2K" + s + "\n")
+    sys.stdout.write(_CLEAR_LINE + s + "\n")
     sys.stdout.flush()
 
 
@@ -65,11 +75,11 @@ def _log(msg: str) -> None:
 
 
 def _user(msg: str) -> None:
-    _write_line_no_prompt(f"{FG_BLUE}User{RESET}: {msg}")
+    _write_line_no_prompt(_USER_PREFIX + msg)
 
 
 def _assistant(msg: str) -> None:
-    _write_line(f"{FG_GREEN}Assistant{RESET}: {msg}")
+    _write_line(_ASSISTANT_PREFIX + msg)
 
 
 def _event(label: str, text: str) -> None:
@@ -97,46 +107,62 @@ def _extract_text_from_messages(messages: list[Any]) -> Optional[str]:
     return None
 
 
-def _extract_text(payload: Any, *, graph_key: str | None = None) -> Optional[str]:
-    """Extract assistant text from various payload shapes."""
-    # Direct string
-    if isinstance(payload, str):
-        return payload
+# Top-level payload keys that may wrap the assistant text
+_NESTED_TEXT_KEYS = ("value", "output")
+
+
+def _text_from_str(payload: str, graph_key: str | None) -> Optional[str]:
+    return payload
+
+
+def _text_from_list(payload: list[Any], graph_key: str | None) -> Optional[str]:
     # List of messages or mixed
-    if isinstance(payload, list):
-        text = _extract_text_from_messages(payload)
-        if text:
-            return text
-        # Fallback: any string entries
-        for v in payload:
-            t = _extract_text(v, graph_key=graph_key)
-            if t:
-                return t
-        return None
-    # Dict payloads
-    if isinstance(payload, dict):
-        # Graph-level direct string
-        if graph_key and isinstance(payload.get(graph_key), str):
-            return payload[graph_key]
-        # Common shapes
-        if isinstance(payload.get("value"), (str, list, dict)):
-            t = _extract_text(payload.get("value"), graph_key=graph_key)
-            if t:
-                return t
-        if isinstance(payload.get("messages"), list):
-            t = _extract_text_from_messages(payload.get("messages", []))
-            if t:
-                return t
-        if isinstance(payload.get("content"), str):
-            return payload.get("content")
-        # Search nested values
-        for v in payload.values():
-            t = _extract_text(v, graph_key=graph_key)
+    text = _extract_text_from_messages(payload)
+    if text:
+        return text
+    # Fallback: any string entries
+    for v in payload:
+        t = _extract_text(v, graph_key=graph_key)
+        if t:
+            return t
+    return None
+
+
+def _text_from_dict(payload: dict[str, Any], graph_key: str | None) -> Optional[str]:
+    get = payload.get
+    # Fast path: graph state with a message list, the shape the agent emits on most parts
+    messages = get("messages")
+    if isinstance(messages, list):
+        t = _extract_text_from_messages(messages)
+        if t:
+            return t
+    # Graph-level direct string
+    if graph_key and isinstance(get(graph_key), str):
+        return payload[graph_key]
+    content = get("content")
+    if isinstance(content, str):
+        return content
+    # Known wrapper keys only: state payloads also hold tool results and histories, which are never
+    # searched. A graph that nests its text under another key needs it added to _NESTED_TEXT_KEYS.
+    for key in _NESTED_TEXT_KEYS:
+        nested = get(key)
+        if isinstance(nested, (str, list, dict)):
+            t = _extract_text(nested, graph_key=graph_key)
             if t:
                 return t
     return None
 
 
+# Payloads are decoded JSON, so their exact type selects the extractor
+_TEXT_EXTRACTORS = {str: _text_from_str, list: _text_from_list, dict: _text_from_dict}
+
+
+def _extract_text(payload: Any, *, graph_key: str | None = None) -> Optional[str]:
+    """Extract assistant text from various payload shapes."""
+    extractor = _TEXT_EXTRACTORS.get(type(payload))
+    return extractor(payload, graph_key) if extractor is not None else None
+
+
 async def stream_run(
     client,
     thread_id: str,
@@ -144,140 +170,120 @@ async def stream_run(
     message: dict,
     label: str,
     *,
-    namespace_for_memory: tuple[str, ...],
-    global_last_text: dict[str, str],  # Shared across runs for deduplication
+    ns_list: list[str],
+    global_last_text: dict[str, int],  # Hash of the last printed text, shared across runs for deduplication
 ) -> int:
     """Stream a run and print output."""
-    printed_once = False
-    command: dict[str, Any] | None = None
-
     config = {
         "configurable": {
             "thread_id": thread_id,
-            "namespace_for_memory": list(namespace_for_memory),
+            "namespace_for_memory": ns_list,
         }
     }
 
-    while True:
-        last_text: Optional[str] = global_last_text.get("last", None)  # Global de-dupe
-        stream = client.runs.stream(
-            thread_id=thread_id,
-            assistant_id=graph,
-            input=message if command is None else None,
-            command=command,
-            stream_mode=["values", "custom"],
-            config=config,
-        )
+    # Global de-dupe on the text hash, so the last (possibly long) text is not kept alive or compared in full
+    last_hash: Optional[int] = global_last_text.get("last", None)
+    stream = client.runs.stream(
+        thread_id=thread_id,
+        assistant_id=graph,
+        input=message,
+        stream_mode=["values", "custom"],
+        config=config,
+    )
 
-        saw_interrupt = False
-        async for part in stream:
-            assert isinstance(part, StreamPart)
-            if part.event == "metadata":
-                data = part.data or {}
-                run_id = (data.get("run_id") if isinstance(data, dict) else None) or "?"
-                _event(label, f"run started (run_id={run_id}, thread_id={thread_id})")
-                continue
-            if part.event == "custom":
-                data = part.data
-                text = _extract_text(data, graph_key=graph)
-                if text and text != last_text:
-                    _assistant(text)
-                    last_text = text
-                    global_last_text["last"] = text
-                continue
-            if part.event == "values":
-                data = part.data
-                text = _extract_text(data, graph_key=graph)
-                if text and text != last_text:
-                    _assistant(text)
-                    last_text = text
-                    global_last_text["last"] = text
-                continue
-            # Uncomment for debug info
-            # if part.event:
-            #     _event(label, f"{part.event} {part.data}")
-            if part.event == "end":
-                return 0
-
-        if saw_interrupt:
-            command = {"resume": None}
+    # Parts are StreamPart tuples already decoded by the SDK (with orjson)
+    async for part in stream:
+        if part.event == "metadata":
+            data = part.data or {}
+            run_id = (data.get("run_id") if isinstance(data, dict) else None) or "?"
+            _event(label, f"run started (run_id={run_id}, thread_id={thread_id})")
             continue
-        return 0
+        if part.event == "custom" or part.event == "values":
+            text = _extract_text(part.data, graph_key=graph)
+            if text and (text_hash := hash(text)) != last_hash:
+                _assistant(text)
+                last_hash = text_hash
+                global_last_text["last"] = text_hash
+            continue
+        # Uncomment for debug info
+        # if part.event:
+        #     _event(label, f"{part.event} {part.data}")
+        if part.event == "end":
+            return 0
+    return 0
 
 
-async def ainput(prompt: str = "") -> str:
-    """Async input wrapper."""
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, lambda: input(prompt))
+# Bytes read from stdin that do not form a returned line yet
+_stdin_buf = bytearray()
+
+
+async def _read_stdin_chunk(loop: asyncio.AbstractEventLoop, fd: int) -> bytes:
+    """Wait until stdin is readable and return what is available (b"" at EOF)."""
+    chunk: asyncio.Future[bytes] = loop.create_future()
+
+    def _on_readable() -> None:
+        if not chunk.done():
+            try:
+                chunk.set_result(os.read(fd, 65536))
+            except OSError as exc:
+                chunk.set_exception(exc)
 
+    loop.add_reader(fd, _on_readable)
+    try:
+        return await chunk
+    finally:
+        loop.remove_reader(fd)
+
+
+async def ainput(prompt: str = "") -> str:
+    """Async input wrapper.
 
-async def read_latest_status(client, namespace_for_memory: tuple[str, ...]) -> dict:
+    Where the event loop can watch file descriptors (POSIX), stdin is read when the loop reports
+    it readable, so no executor thread is parked on input() for the whole session. Raw reads are
+    split into lines here: several lines arriving at once (a paste, piped input) are returned one
+    per call instead of hiding in a buffer the event loop cannot see.
+    """
+    loop = asyncio.get_running_loop()
+    if prompt:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+    while (end := _stdin_buf.find(b"\n")) < 0:
+        try:
+            chunk = await _read_stdin_chunk(loop, sys.stdin.fileno())
+        except (NotImplementedError, OSError):
+            # Proactor event loop (Windows) or stdin that cannot be polled (a regular file)
+            return await loop.run_in_executor(None, input)
+        if not chunk:
+            if not _stdin_buf:
+                raise EOFError
+            # Last line without a trailing newline
+            end = len(_stdin_buf)
+            break
+        _stdin_buf.extend(chunk)
+    line = bytes(_stdin_buf[:end])
+    del _stdin_buf[: end + 1]
+    return line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r")
+
+
+async def read_latest_status(client, ns_list: list[str]) -> dict:
     """Read the latest tool status from the store."""
-    ns_list = list(namespace_for_memory)
     try:
-        items = await client.store.search_items(ns_list)
+        item = await client.store.get_item(ns_list, "working-tool-status-update")
     except Exception:
+        # Missing key (404) or unreachable store
         return {}
-    
-    # Normalize return shape: SDK may return a dict with 'items' or a bare list
-    items_list: list[Any] | None = None
-    if isinstance(items, dict):
-        inner = items.get("items")
-        if isinstance(inner, list):
-            items_list = inner
-    elif isinstance(items, list):
-        items_list = items
-    
-    if not items_list:
-        return {}
-    
-    # Walk from the end to find the most recent item that has a 'status'
-    for item in reversed(items_list):
-        value = getattr(item, "value", None)
-        if value is None and isinstance(item, dict):
-            value = item.get("value")
-        if isinstance(value, dict) and "status" in value:
-            return value
-    
-    # Fallback to last value if present
-    last = items_list[-1]
-    value = getattr(last, "value", None)
-    if value is None and isinstance(last, dict):
-        value = last.get("value")
+    value = item.get("value") if isinstance(item, dict) else None
     return value if isinstance(value, dict) else {}
 
 
-async def check_completion_flag(client, namespace_for_memory: tuple[str, ...]) -> bool:
+async def check_completion_flag(client, ns_list: list[str]) -> bool:
     """Check if main operation has completed recently."""
-    ns_list = list(namespace_for_memory)
     try:
-        items = await client.store.search_items(ns_list)
+        item = await client.store.get_item(ns_list, "main_operation_complete")
     except Exception:
         return False
-    
-    # Normalize return shape
-    items_list: list[Any] | None = None
-    if isinstance(items, dict):
-        inner = items.get("items")
-        if isinstance(inner, list):
-            items_list = inner
-    elif isinstance(items, list):
-        items_list = items
-    
-    if not items_list:
-        return False
-    
-    # Look for completion flag
-    for item in reversed(items_list):
-        key = getattr(item, "key", None) or (item.get("key") if isinstance(item, dict) else None)
-        if key == "main_operation_complete":
-            value = getattr(item, "value", None)
-            if value is None and isinstance(item, dict):
-                value = item.get("value")
-            if isinstance(value, dict) and value.get("ready_for_new_operation"):
-                return True
-    
-    return False
+    value = item.get("value") if isinstance(item, dict) else None
+    return isinstance(value, dict) and bool(value.get("ready_for_new_operation"))
 
 
 async def run_client(
@@ -288,8 +294,28 @@ async def run_client(
     thread_file: str | None,
     initial_message: str | None,
 ) -> int:
-    """Main client logic."""
+    """Run a client session against the LangGraph server."""
+    # One client, and therefore one pooled httpx.AsyncClient with keep-alive connections, serves every
+    # store lookup and run stream of the session. Close it on exit so the pooled connections are released.
+    from langgraph_sdk import get_client
+
     client = get_client(url=base_url)
+    try:
+        return await _run_session(client, graph, user_id, interactive, thread_file, initial_message)
+    finally:
+        await client.http.client.aclose()
+
+
+async def _run_session(
+    client,
+    graph: str,
+    user_id: str,
+    interactive: bool,
+    thread_file: str | None,
+    initial_message: str | None,
+) -> int:
+    """Main client logic."""
+    import httpx
 
     # Primary and secondary thread ids
     thread_path = Path(thread_file) if thread_file else None
@@ -338,6 +364,8 @@ async def run_client(
 
     # Shared namespace used by server agent's tools
     namespace_for_memory = (user_id, "tools_updates")
+    # The SDK sends namespaces as JSON arrays; convert once for every request of the session
+    ns_list = list(namespace_for_memory)
 
     print(f"{FG_MAGENTA}Telco Agent Multi-Threaded Client{RESET}")
     print(f"Main Thread ID: {FG_CYAN}{thread_id_main}{RESET}")
@@ -351,23 +379,27 @@ async def run_client(
         print(f"{FG_GRAY}Long operations will run in background. You can ask questions while they run.{RESET}")
         print()
         
-        # Clear any stale flags from previous sessions
-        try:
-            ns_list = list(namespace_for_memory)
-            await client.store.delete_item(ns_list, "main_operation_complete")
-            await client.store.delete_item(ns_list, "working-tool-status-update")
-            await client.store.delete_item(ns_list, "secondary_status")
-            await client.store.delete_item(ns_list, "secondary_abort")
-            await client.store.delete_item(ns_list, "secondary_interim_messages")
-        except Exception:
-            pass  # Flags might not exist, that's okay
+        # Clear any stale flags from previous sessions, concurrently. Flags might not exist, that's okay
+        await asyncio.gather(
+            *(
+                client.store.delete_item(ns_list, key)
+                for key in (
+                    "main_operation_complete",
+                    "working-tool-status-update",
+                    "secondary_status",
+                    "secondary_abort",
+                    "secondary_interim_messages",
+                )
+            ),
+            return_exceptions=True,
+        )
         
         _show_prompt()
         
         # Track background task and state
         main_job: asyncio.Task[int] | None = None
         interim_messages_reset = True
-        global_last_text: dict[str, str] = {}  # Global deduplication
+        global_last_text: dict[str, int] = {}  # Global deduplication
         cooldown_until: float = 0  # Cooldown timestamp
         last_operation_complete_time: float = 0
 
@@ -381,7 +413,7 @@ async def run_client(
             if not user_text:
                 continue
             
-            if user_text.lower() in {"exit", "quit", "/exit"}:
+            if user_text.lower() in EXIT_COMMANDS:
                 break
             
             _user(user_text)
@@ -394,22 +426,21 @@ async def run_client(
                 await asyncio.sleep(cooldown_until - current_time)
                 cooldown_until = 0
                 # Clear completion flag after cooldown
+                # Try to delete completion flag (may not exist)
                 try:
-                    ns_list = list(namespace_for_memory)
-                    # Try to delete completion flag (may not exist)
-                    try:
-                        await client.store.delete_item(ns_list, "main_operation_complete")
-                    except Exception:
-                        pass
+                    await client.store.delete_item(ns_list, "main_operation_complete")
                 except Exception:
                     pass
 
             # Determine current status based ONLY on server-side store
             # Don't use main_job.done() because the client task finishes quickly
             # even though the server operation continues
-            long_info = await read_latest_status(client, namespace_for_memory)
+            # The two lookups are independent, so they run concurrently
+            long_info, just_completed = await asyncio.gather(
+                read_latest_status(client, ns_list),
+                check_completion_flag(client, ns_list),
+            )
             long_running = bool(long_info.get("status") == "running")
-            just_completed = await check_completion_flag(client, namespace_for_memory)
             
             # If operation just completed, set cooldown but don't skip the message
             if just_completed and last_operation_complete_time != current_time:
@@ -420,7 +451,6 @@ async def run_client(
                 main_job = None
                 # Clear completion flag
                 try:
-                    ns_list = list(namespace_for_memory)
                     await client.store.delete_item(ns_list, "main_operation_complete")
                 except Exception:
                     pass
@@ -430,7 +460,9 @@ async def run_client(
             # Routing logic: Use ONLY server-side status, not client task status
             if long_running and not just_completed:
                 # Secondary thread: handle queries during long operation
-                progress = long_info.get("progress", "?")
+                progress = current_progress(long_info)
+                if progress is None:
+                    progress = "?"
                 tool_name = long_info.get("tool_name", "operation")
                 _event("routing", f"Operation in progress ({progress}%), routing to secondary thread")
                 payload = {
@@ -444,7 +476,7 @@ async def run_client(
                     graph,
                     payload,
                     label=f"secondary [{progress}%]",
-                    namespace_for_memory=namespace_for_memory,
+                    ns_list=ns_list,
                     global_last_text=global_last_text,
                 )
                 interim_messages_reset = False
@@ -466,7 +498,7 @@ async def run_client(
                         graph,
                         payload,
                         label="main",
-                        namespace_for_memory=namespace_for_memory,
+                        ns_list=ns_list,
                         global_last_text=global_last_text,
                     )
                     # After completion, signal cooldown
@@ -490,14 +522,14 @@ async def run_client(
             "thread_type": "main",
             "interim_messages_reset": True,
         }
-        global_last_text: dict[str, str] = {}
+        global_last_text: dict[str, int] = {}
         return await stream_run(
             client,
             thread_id_main,
             graph,
             payload,
             label="single",
-            namespace_for_memory=namespace_for_memory,
+            ns_list=ns_list,
             global_last_text=global_last_text,
         )
 
@@ -553,16 +585,24 @@ Examples:
     )
     args = parser.parse_args(argv)
 
-    return asyncio.run(
-        run_client(
-            base_url=args.url,
-            graph=args.graph,
-            user_id=args.user,
-            interactive=args.interactive,
-            thread_file=args.thread_file,
-            initial_message=args.message,
+    try:
+        import uvloop
+
+        loop_factory = uvloop.new_event_loop
+    except ImportError:  # uvloop is optional (not available on Windows)
+        loop_factory = None
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(
+            run_client(
+                base_url=args.url,
+                graph=args.graph,
+                user_id=args.user,
+                interactive=args.interactive,
+                thread_file=args.thread_file,
+                initial_message=args.message,
+            )
         )
-    )
 
 
 if __name__ == "__main__":
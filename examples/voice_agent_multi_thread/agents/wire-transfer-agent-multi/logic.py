@@ -1,12 +1,24 @@
+import functools
 import os
 import json
 import uuid
 from datetime import datetime
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from langchain_openai import ChatOpenAI
+
+# Same import fallback as tools.py: this module is loaded by path when the package import fails
+try:
+    from .prompts import EXPLAIN_FEE_PROMPT  # type: ignore
+except Exception:
+    import importlib.util as _ilu
+    _prompts_path = os.path.join(os.path.dirname(__file__), "prompts.py")
+    _spec = _ilu.spec_from_file_location("wire_transfer_agent_prompts", _prompts_path)
+    _prompts = _ilu.module_from_spec(_spec)  # type: ignore
+    assert _spec and _spec.loader
+    _spec.loader.exec_module(_prompts)  # type: ignore
+    EXPLAIN_FEE_PROMPT = _prompts.EXPLAIN_FEE_PROMPT
 
 
 _FIXTURE_CACHE: Dict[str, Any] = {}
@@ -75,6 +87,31 @@ def find_customer_by_name(first_name: str, last_name: str) -> Dict[str, Any]:
     return {}
 
 
+@functools.lru_cache(maxsize=1)
+def _customer_ids_by_name() -> Dict[Tuple[str, str], str]:
+    # accounts.json is cached and never mutated, so the name index only has to be built once
+    data = _load_fixture("accounts.json")
+    index: Dict[Tuple[str, str], str] = {}
+    for cid, blob in data.get("customers", {}).items():
+        prof = blob.get("profile") if isinstance(blob, dict) else None
+        if isinstance(prof, dict):
+            pfn = str(prof.get("first_name") or "").strip().lower()
+            pln = str(prof.get("last_name") or "").strip().lower()
+            # First customer wins on duplicate names, like find_customer_by_name
+            index.setdefault((pfn, pln), cid)
+    return index
+
+
+def find_customer_id_by_name_pairs(pairs: List[Tuple[str, str]]) -> Optional[str]:
+    """Return the customer_id of the first (first_name, last_name) pair that matches a customer."""
+    index = _customer_ids_by_name()
+    for first_name, last_name in pairs:
+        cid = index.get(((first_name or "").strip().lower(), (last_name or "").strip().lower()))
+        if cid:
+            return cid
+    return None
+
+
 def find_customer_by_full_name(full_name: str) -> Dict[str, Any]:
     data = _load_fixture("accounts.json")
     customers = data.get("customers", {})
@@ -509,6 +546,15 @@ def detect_fees(transactions: List[Dict[str, Any]], schedule: Dict[str, Any]) ->
     return results
 
 
+@functools.lru_cache(maxsize=4)
+def _explain_fee_chain(model: str, api_key: str):
+    """Build the fee explanation chain once per model and key; the prompt and client are reused across calls."""
+    # Imported here so loading the wire-transfer tools does not pull in the OpenAI client
+    from langchain_openai import ChatOpenAI
+
+    return EXPLAIN_FEE_PROMPT | ChatOpenAI(model=model, api_key=api_key)
+
+
 def explain_fee(fee_event: Dict[str, Any]) -> str:
     openai_api_key = os.getenv("OPENAI_API_KEY")
     code = (fee_event.get("fee_code") or "").upper()
@@ -526,8 +572,7 @@ def explain_fee(fee_event: Dict[str, Any]) -> str:
             return base + " This fee applies to certain ATM withdrawals."
         return base + " This fee was identified based on your recent transactions."
 
-    llm = ChatOpenAI(model=os.getenv("EXPLAIN_MODEL", "gpt-4o"), api_key=openai_api_key)
-    chain = EXPLAIN_FEE_PROMPT | llm
+    chain = _explain_fee_chain(os.getenv("EXPLAIN_MODEL", "gpt-4o"), openai_api_key)
     out = chain.invoke(
         {
             "fee_code": code,
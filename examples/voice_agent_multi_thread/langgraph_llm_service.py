@@ -10,6 +10,9 @@ back as `LLMTextFrame` until completion.
 from __future__ import annotations
 
 import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from typing import Any, Optional
 import os
 from dotenv import load_dotenv
@@ -30,32 +33,73 @@ from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext,
 from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.openai.llm import OpenAILLMService
 
+from agents.helper_functions import current_progress
+
 
 load_dotenv()
 
 # TTS sanitize helper: normalize curly quotes/dashes and non-breaking spaces to ASCII
+_TTS_TRANS = str.maketrans({
+    "\u2018": "'",  # left single quote
+    "\u2019": "'",  # right single quote / apostrophe
+    "\u201C": '"',   # left double quote
+    "\u201D": '"',   # right double quote
+    "\u00AB": '"',   # left angle quote
+    "\u00BB": '"',   # right angle quote
+    "\u2013": "-",  # en dash
+    "\u2014": "-",  # em dash
+    "\u2026": "...",# ellipsis
+    "\u00A0": " ",  # non-breaking space
+    "\u202F": " ",  # narrow no-break space
+})
+
+
 def _tts_sanitize(text: str) -> str:
-    try:
-        if not isinstance(text, str):
-            text = str(text)
-        replacements = {
-            "\u2018": "'",  # left single quote
-            "\u2019": "'",  # right single quote / apostrophe
-            "\u201C": '"',   # left double quote
-            "\u201D": '"',   # right double quote
-            "\u00AB": '"',   # left angle quote
-            "\u00BB": '"',   # right angle quote
-            "\u2013": "-",  # en dash
-            "\u2014": "-",  # em dash
-            "\u2026": "...",# ellipsis
-            "\u00A0": " ",  # non-breaking space
-            "\u202F": " ",  # narrow no-break space
-        }
-        for k, v in replacements.items():
-            text = text.replace(k, v)
-        return text
-    except Exception:
+    if not isinstance(text, str):
+        text = str(text)
+    # Most tokens are plain ASCII and contain none of the mapped characters
+    if text.isascii():
         return text
+    # One pass over the string instead of one str.replace per character
+    return text.translate(_TTS_TRANS)
+
+
+# Upper bound on the texts remembered for dedupe within one turn
+_EMITTED_MAX = 4096
+# Streamed tokens are coalesced into one LLMTextFrame per ~64 chars, per sentence end, or per
+# 30 ms, whichever comes first, instead of one frame per token
+_TOKEN_FLUSH_CHARS = 64
+_TOKEN_FLUSH_SECONDS = 0.03
+_SENTENCE_END_CHARS = frozenset(".!?\n")
+# Store lookups for the long-operation status are reused for this long, so turns arriving in
+# quick succession do not each wait on their own search_items round-trip
+_OP_STATUS_TTL_SECONDS = 0.3
+
+
+@dataclass(slots=True)
+class _StreamState:
+    """State of one `_stream_langgraph_impl` call.
+
+    The background main-thread stream and a foreground secondary stream run concurrently on the
+    same service, so anything buffered per stream lives here rather than on the instance.
+    """
+
+    is_background: bool
+    token_buf: list[str] = field(default_factory=list)
+    token_buf_len: int = 0
+    token_buf_started: float = 0.0
+    # Message id -> text parts already spoken from "messages-tuple" events
+    spoken: dict[Optional[str], list[str]] = field(default_factory=dict)
+
+    def already_spoken(self, message_id: Optional[str], text: str) -> bool:
+        """Whether a final message was already spoken token by token during this stream."""
+        if not self.spoken:
+            return False
+        if message_id is not None and message_id in self.spoken:
+            return True
+        # Final messages rebuilt from the streamed reply (e.g. a synthesized answer) get a new id
+        return any("".join(parts) == text for parts in self.spoken.values())
+
 
 class LangGraphLLMService(OpenAILLMService):
     """Pipecat LLM service that delegates responses to a LangGraph agent.
@@ -64,7 +108,9 @@ class LangGraphLLMService(OpenAILLMService):
         base_url: LangGraph API base URL, e.g. "http://127.0.0.1:2024".
         assistant: Assistant name or id registered with the LangGraph server.
         user_email: Value for `configurable.user_email` (routing / personalization).
-        stream_mode: SDK stream mode ("updates", "values", "messages", "events").
+        stream_mode: SDK stream mode ("updates", "values", "messages", "messages-tuple", "events").
+            "messages-tuple" forwards LLM tokens to TTS as they are generated; combine it with
+            "values", which speaks final messages that were not streamed and skips those that were.
         debug_stream: When True, logs raw stream events for troubleshooting.
     """
 
@@ -111,6 +157,11 @@ class LangGraphLLMService(OpenAILLMService):
         # Namespace for store coordination - sanitize email (periods not allowed)
         sanitized_email = self.user_email.replace(".", "_").replace("@", "_at_")
         self._namespace_for_memory: tuple[str, str] = (sanitized_email, "tools_updates")
+        # The SDK takes the namespace as a list; built once and shared by every request
+        self._namespace_list: list[str] = [sanitized_email, "tools_updates"]
+        # Run config per thread id, built on first use. Thread ids are stable per thread type, so
+        # turns reuse these dicts; they are never mutated, so a background run can keep its own
+        self._run_configs: dict[Optional[str], dict] = {}
         
         # Track interim message reset state
         self._interim_messages_reset: bool = True
@@ -118,13 +169,66 @@ class LangGraphLLMService(OpenAILLMService):
         
         self._current_task: Optional[asyncio.Task] = None
         self._outer_open: bool = False
-        self._emitted_texts: set[str] = set()
+        # Hashes of texts already pushed this turn, for dedupe. Bounded: the oldest entries are
+        # forgotten first so a long streamed turn cannot grow it without limit
+        self._emitted_order: deque[int] = deque()
+        self._emitted_hashes: set[int] = set()
+        # (messages list, its length, index of the latest user message or -1, last scanned message,
+        # latest user message) from the last scan
+        self._user_scan: Optional[tuple[list, int, int, Any, Any]] = None
         
         # Background task for main thread long operations
         self._background_main_task: Optional[asyncio.Task] = None
         self._background_final_message: Optional[str] = None
         self._background_monitor_task: Optional[asyncio.Task] = None
         self._background_task_is_long_operation: bool = False  # Track if current background task is a long operation
+        # (monotonic time, result) of the last long-operation store check
+        self._op_status_cache: Optional[tuple[float, bool]] = None
+
+    def _is_emitted(self, text: str) -> bool:
+        return hash(text) in self._emitted_hashes
+
+    def _add_emitted(self, text: str) -> None:
+        h = hash(text)
+        if h in self._emitted_hashes:
+            return
+        if len(self._emitted_order) >= _EMITTED_MAX:
+            self._emitted_hashes.discard(self._emitted_order.popleft())
+        self._emitted_order.append(h)
+        self._emitted_hashes.add(h)
+
+    def _clear_emitted(self) -> None:
+        self._emitted_order.clear()
+        self._emitted_hashes.clear()
+
+    async def _push_token(self, stream: _StreamState, token: str) -> None:
+        """Buffer a streamed token, pushing the buffer once it is long enough, ends a sentence or is 30 ms old."""
+        if not stream.token_buf:
+            stream.token_buf_started = time.monotonic()
+        stream.token_buf.append(token)
+        stream.token_buf_len += len(token)
+        if (
+            stream.token_buf_len >= _TOKEN_FLUSH_CHARS
+            or token[-1] in _SENTENCE_END_CHARS
+            or time.monotonic() - stream.token_buf_started >= _TOKEN_FLUSH_SECONDS
+        ):
+            await self._flush_tokens(stream)
+
+    async def _flush_tokens(self, stream: _StreamState) -> None:
+        if not stream.token_buf:
+            return
+        text = "".join(stream.token_buf)
+        stream.token_buf.clear()
+        stream.token_buf_len = 0
+        await self.push_frame(LLMTextFrame(_tts_sanitize(text)))
+
+    async def _push_utterance(self, text: str) -> None:
+        """Push a complete bot utterance: start, sanitized text and end frames back to back."""
+        # Awaited in order rather than gathered or spawned: push_frame may suspend before it
+        # queues the frame, so concurrent pushes could reach TTS out of order
+        await self.push_frame(LLMFullResponseStartFrame())
+        await self.push_frame(LLMTextFrame(_tts_sanitize(text)))
+        await self.push_frame(LLMFullResponseEndFrame())
 
     async def _ensure_thread(self, thread_type: str = "main") -> Optional[str]:
         """Ensure thread exists for the given type (main or secondary)."""
@@ -168,9 +272,8 @@ class LangGraphLLMService(OpenAILLMService):
             # Wait for the background task to complete
             await self._background_main_task
             logger.info("🏁 Background main task completed, checking for final message")
-            
-            # Give a VERY brief moment for the final message to be captured (minimize race window)
-            await asyncio.sleep(0.1)
+            # No wait needed here: the final message is captured by the background task itself,
+            # so it is already set (or never will be) once the task has finished
             
             # If we captured a final message, inject it as a new bot-initiated turn
             if self._background_final_message:
@@ -178,14 +281,7 @@ class LangGraphLLMService(OpenAILLMService):
                 logger.info(f"Message to inject: {self._background_final_message}")
                 
                 # Simply push the frames directly - they should flow through TTS
-                await self.push_frame(LLMFullResponseStartFrame())
-                logger.info("✅ Pushed LLMFullResponseStartFrame")
-                
-                await self.push_frame(LLMTextFrame(_tts_sanitize(self._background_final_message)))
-                logger.info(f"✅ Pushed LLMTextFrame with content")
-                
-                await self.push_frame(LLMFullResponseEndFrame())
-                logger.info("✅ Pushed LLMFullResponseEndFrame")
+                await self._push_utterance(self._background_final_message)
                 
                 # Clear the captured message
                 self._background_final_message = None
@@ -199,6 +295,24 @@ class LangGraphLLMService(OpenAILLMService):
         finally:
             self._background_main_task = None
             self._background_monitor_task = None
+            # The long operation is over, so the next turn must query the store again
+            self._op_status_cache = None
+
+    async def _cancel_background_tasks(self, reason: str) -> None:
+        """Cancel the background main task and its monitor together and wait for both to finish."""
+        tasks = [
+            task
+            for task in (self._background_main_task, self._background_monitor_task)
+            if task is not None and not task.done()
+        ]
+        if tasks:
+            logger.info(reason)
+            for task in tasks:
+                task.cancel()
+            # One wait for both; their CancelledError is collected instead of raised
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._background_main_task = None
+        self._background_monitor_task = None
 
     async def _check_long_operation_running(self) -> bool:
         """Check if a long operation is currently running via the store."""
@@ -206,12 +320,22 @@ class LangGraphLLMService(OpenAILLMService):
             logger.info("Multi-threading disabled, returning False")
             return False
         
+        now = time.monotonic()
+        cached = self._op_status_cache
+        if cached is not None and now - cached[0] < _OP_STATUS_TTL_SECONDS:
+            logger.debug("Reusing long operation status from {:.3f}s ago: {}", now - cached[0], cached[1])
+            return cached[1]
+        result = await self._query_long_operation_running()
+        self._op_status_cache = (now, result)
+        return result
+
+    async def _query_long_operation_running(self) -> bool:
+        """Query the store for the status of the most recent long operation."""
         try:
-            ns_list = list(self._namespace_for_memory)
-            logger.info(f"Checking store with namespace: {ns_list}")
+            logger.info(f"Checking store with namespace: {self._namespace_list}")
             
             # Use search_items() like the working client code does
-            items = await self._client.store.search_items(ns_list)
+            items = await self._client.store.search_items(self._namespace_list)
             logger.info(f"🔎 search_items returned: type={type(items)}")
             
             # Normalize return shape: SDK may return a dict with 'items' or a bare list (matching text client)
@@ -238,12 +362,22 @@ class LangGraphLLMService(OpenAILLMService):
                 if value is None and isinstance(item, dict):
                     value = item.get("value")
                 
-                value_keys = list(value.keys()) if isinstance(value, dict) else "N/A"
-                logger.info(f"📦 Item {idx} (from end): key={item_key}, value_keys={value_keys}")
+                # Per item, so debug level and formatted lazily: no key list is built unless it is logged
+                logger.opt(lazy=True).debug(
+                    "📦 Item {} (from end): key={}, value_keys={}",
+                    lambda idx=idx: idx,
+                    lambda item_key=item_key: item_key,
+                    lambda value=value: list(value.keys()) if isinstance(value, dict) else "N/A",
+                )
                 
                 if isinstance(value, dict) and "status" in value:
                     status = value.get("status")
-                    logger.info(f"🔍 Long operation check: status={status}, tool={value.get('tool_name')}, progress={value.get('progress')}")
+                    logger.info(
+                        "🔍 Long operation check: status={}, tool={}, progress={}",
+                        status,
+                        value.get("tool_name"),
+                        current_progress(value),
+                    )
                     return status == "running"
             
             logger.info("No status items found in store")
@@ -252,8 +386,7 @@ class LangGraphLLMService(OpenAILLMService):
             logger.error(f"❌ Failed to check operation status: {exc}", exc_info=True)
             return False
 
-    @staticmethod
-    def _extract_latest_user_text(context: OpenAILLMContext) -> str:
+    def _extract_latest_user_text(self, context: OpenAILLMContext) -> str:
         """Return the latest user (or fallback system) message content.
 
         The LangGraph server maintains history via threads, so we only need to
@@ -261,13 +394,38 @@ class LangGraphLLMService(OpenAILLMService):
         fall back to the latest system message so system-only kickoffs can work.
         """
         messages = context.get_messages() or []
-        for msg in reversed(messages):
+        # The context keeps appending to the same list, so only messages added since the last
+        # call need scanning; the cache holds the list itself, so a new list never matches it.
+        # set_messages() replaces the contents in place, so the previously scanned tail and the
+        # user message found in it must also still be the same objects.
+        stop, found = -1, -1
+        cached = self._user_scan
+        if cached is not None:
+            cached_list, scanned, cached_found, last_scanned, found_msg = cached
+            if (
+                cached_list is messages
+                and 0 < scanned <= len(messages)
+                and messages[scanned - 1] is last_scanned
+                and (cached_found < 0 or messages[cached_found] is found_msg)
+            ):
+                stop, found = scanned - 1, cached_found
+        for i in range(len(messages) - 1, stop, -1):
             try:
-                if msg.get("role") == "user":
-                    content = msg.get("content", "")
-                    return content if isinstance(content, str) else str(content)
+                if messages[i].get("role") == "user":
+                    found = i
+                    break
             except Exception:  # Defensive against unexpected shapes
                 continue
+        self._user_scan = (
+            messages,
+            len(messages),
+            found,
+            messages[-1] if messages else None,
+            messages[found] if found >= 0 else None,
+        )
+        if found >= 0:
+            content = messages[found].get("content", "")
+            return content if isinstance(content, str) else str(content)
         # Fallback: use the most recent system message if no user message exists
         for msg in reversed(messages):
             try:
@@ -278,8 +436,179 @@ class LangGraphLLMService(OpenAILLMService):
                 continue
         return ""
 
+    async def _on_token_event(self, data: Any, stream: _StreamState) -> None:
+        """Token streaming events (LangChain chat model streaming)."""
+        part_text = ""
+        d = data
+        if isinstance(d, dict):
+            if "chunk" in d:
+                ch = d["chunk"]
+                part_text = getattr(ch, "content", None) or ""
+                if not isinstance(part_text, str):
+                    part_text = str(part_text)
+            elif "delta" in d:
+                delta = d["delta"]
+                part_text = getattr(delta, "content", None) or ""
+                if not isinstance(part_text, str):
+                    part_text = str(part_text)
+            elif "content" in d and isinstance(d["content"], str):
+                part_text = d["content"]
+        else:
+            part_text = getattr(d, "content", "")
+
+        if part_text:
+            if not self._outer_open:
+                await self.push_frame(LLMFullResponseStartFrame())
+                self._outer_open = True
+                self._clear_emitted()
+            if not self._is_emitted(part_text):
+                self._add_emitted(part_text)
+                await self._push_token(stream, part_text)
+
+    async def _on_custom_event(self, data: Any, stream: _StreamState) -> None:
+        """Custom events from get_stream_writer() - tool progress messages."""
+        custom_text = ""
+        if isinstance(data, str):
+            custom_text = data
+        elif isinstance(data, dict):
+            # Try to extract text from custom event data
+            custom_text = data.get("content") or data.get("text") or ""
+        elif hasattr(data, "content"):
+            custom_text = getattr(data, "content", "")
+
+        if custom_text and isinstance(custom_text, str) and not self._is_emitted(custom_text):
+            logger.info("📢 Custom event (tool message): {:.100}", custom_text)
+            self._add_emitted(custom_text)
+            # Emit as its own turn
+            if self._outer_open:
+                await self.push_frame(LLMFullResponseEndFrame())
+                self._outer_open = False
+            await self._push_utterance(custom_text)
+
+    async def _on_values_event(self, data: Any, stream: _StreamState) -> None:
+        """Final value-style events (values mode)."""
+        # Some dev servers send final AI message content here
+        final_text = ""
+        final_id = None
+        # Values events arrive for every graph step, so their logs are debug level and use
+        # loguru's deferred formatting: nothing is formatted when debug logging is off
+        logger.debug("📊 Processing values event: data_type={}, is_background={}", type(data), stream.is_background)
+
+        # Handle list of messages (most common case)
+        if isinstance(data, list) and data:
+            logger.debug("📊 Data is list with {} items", len(data))
+            # Find the last AI message in the list
+            for msg in reversed(data):
+                if isinstance(msg, dict):
+                    if msg.get("type") == "ai" and isinstance(msg.get("content"), str):
+                        final_text = msg["content"]
+                        final_id = msg.get("id")
+                        logger.debug("✅ Found AI message in dict: {:.100}", final_text)
+                        break
+                elif hasattr(msg, "type") and getattr(msg, "type") == "ai":
+                    content = getattr(msg, "content", None)
+                    if isinstance(content, str):
+                        final_text = content
+                        final_id = getattr(msg, "id", None)
+                        logger.debug("✅ Found AI message in object: {:.100}", final_text)
+                        break
+        # Handle single message object
+        elif hasattr(data, "content") and isinstance(getattr(data, "content"), str):
+            final_text = getattr(data, "content")
+            logger.debug("✅ Found content in object: {:.100}", final_text)
+        # Handle single message dict
+        elif isinstance(data, dict):
+            c = data.get("content")
+            if isinstance(c, str):
+                final_text = c
+                logger.debug("✅ Found content in dict: {:.100}", final_text)
+
+        if final_text and not self._is_emitted(final_text):
+            if stream.is_background:
+                # Running in background - capture for later injection
+                # Only capture if there's no pending message waiting to be injected
+                if not self._background_final_message:
+                    logger.info("💾 Capturing final message from background task")
+                    self._background_final_message = final_text
+                    self._add_emitted(final_text)
+                else:
+                    logger.info("⚠️  Skipping capture - pending message already exists: {:.50}...", self._background_final_message)
+                # Close any open utterance
+                if self._outer_open:
+                    await self.push_frame(LLMFullResponseEndFrame())
+                    self._outer_open = False
+            elif stream.already_spoken(final_id, final_text):
+                # Streamed token by token already; the open utterance is closed when the turn ends
+                self._add_emitted(final_text)
+            else:
+                # Normal foreground - push immediately
+                # Close backchannel utterance if open
+                if self._outer_open:
+                    await self.push_frame(LLMFullResponseEndFrame())
+                    self._outer_open = False
+                # Emit final explanation as its own message
+                self._add_emitted(final_text)
+                await self._push_utterance(final_text)
+
+    async def _on_messages_event(self, data: Any, stream: _StreamState) -> None:
+        """Messages mode: token chunks (messages-tuple) or an array of messages."""
+        # "messages-tuple" mode: (message, metadata) pairs streamed token by token while the
+        # agent's LLM generates, so TTS can start on the first sentence instead of waiting for
+        # the final message. Background runs only report their final message.
+        if isinstance(data, list) and len(data) == 2 and isinstance(data[0], dict):
+            message, metadata = data
+            text = message.get("content")
+            if stream.is_background or not isinstance(text, str) or not text:
+                return
+            metadata = metadata if isinstance(metadata, dict) else {}
+            # LLM calls made inside a tool produce tool output, not the reply
+            if metadata.get("langgraph_node") == "call_tool":
+                return
+            message_id = message.get("id")
+            message_type = message.get("type")
+            if message_type == "ai":
+                # A whole message from a chat model run that did not stream (an LLM cache hit).
+                # Whole messages returned by the graph itself also arrive here; those may include
+                # earlier turns and are left to the values event.
+                if "ls_provider" not in metadata or message_id in stream.spoken:
+                    return
+            elif message_type != "AIMessageChunk":
+                return
+            if not self._outer_open:
+                await self.push_frame(LLMFullResponseStartFrame())
+                self._outer_open = True
+                self._clear_emitted()
+            # Tokens repeat ("the", " ") so they bypass the emitted-text dedupe; the values event
+            # skips the final message through stream.spoken instead
+            stream.spoken.setdefault(message_id, []).append(text)
+            await self._push_token(stream, text)
+            return
+        # Array of messages: emit the last one
+        try:
+            msgs = None
+            if isinstance(data, dict):
+                msgs = data.get("messages") or data.get("result") or data.get("value")
+            elif hasattr(data, "messages"):
+                msgs = getattr(data, "messages")
+            if isinstance(msgs, list) and msgs:
+                last = msgs[-1]
+                content = getattr(last, "content", None)
+                if content is None and isinstance(last, dict):
+                    content = last.get("content")
+                if isinstance(content, str) and content:
+                    if not self._outer_open:
+                        await self.push_frame(LLMFullResponseStartFrame())
+                        self._outer_open = True
+                        self._clear_emitted()
+                    if not self._is_emitted(content):
+                        self._add_emitted(content)
+                        await self.push_frame(LLMTextFrame(_tts_sanitize(content)))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"LangGraph messages parsing error: {exc}")
+
     async def _stream_langgraph_impl(self, text: str, thread_type: str, thread_id: Optional[str], config: dict, input_payload: Any, is_background: bool = False) -> None:
         """Internal implementation of LangGraph streaming."""
+        stream = _StreamState(is_background)
         try:
             logger.info(f"🎬 Starting stream with mode: {self.stream_mode} (type: {type(self.stream_mode)})")
             async for chunk in self._client.runs.stream(
@@ -291,6 +620,9 @@ class LangGraphLLMService(OpenAILLMService):
             ):
                 data = getattr(chunk, "data", None)
                 event = getattr(chunk, "event", "") or ""
+                # Buffered tokens go out before any other event can emit or close an utterance
+                if stream.token_buf and not ("on_chat_model_stream" in event or (event == "messages" and isinstance(data, list))):
+                    await self._flush_tokens(stream)
 
                 if self.debug_stream:
                     try:
@@ -306,139 +638,16 @@ class LangGraphLLMService(OpenAILLMService):
                     except Exception:  # noqa: BLE001
                         logger.debug(f"[LangGraph stream] event={event}")
 
-                # Token streaming events (LangChain chat model streaming)
-                if "on_chat_model_stream" in event or event.endswith(".on_chat_model_stream"):
-                    part_text = ""
-                    d = data
-                    if isinstance(d, dict):
-                        if "chunk" in d:
-                            ch = d["chunk"]
-                            part_text = getattr(ch, "content", None) or ""
-                            if not isinstance(part_text, str):
-                                part_text = str(part_text)
-                        elif "delta" in d:
-                            delta = d["delta"]
-                            part_text = getattr(delta, "content", None) or ""
-                            if not isinstance(part_text, str):
-                                part_text = str(part_text)
-                        elif "content" in d and isinstance(d["content"], str):
-                            part_text = d["content"]
-                    else:
-                        part_text = getattr(d, "content", "")
-
-                    if part_text:
-                        if not self._outer_open:
-                            await self.push_frame(LLMFullResponseStartFrame())
-                            self._outer_open = True
-                            self._emitted_texts.clear()
-                        if part_text not in self._emitted_texts:
-                            self._emitted_texts.add(part_text)
-                            await self.push_frame(LLMTextFrame(_tts_sanitize(part_text)))
-                
-                # Custom events from get_stream_writer() - tool progress messages
-                if event == "custom":
-                    custom_text = ""
-                    if isinstance(data, str):
-                        custom_text = data
-                    elif isinstance(data, dict):
-                        # Try to extract text from custom event data
-                        custom_text = data.get("content") or data.get("text") or ""
-                    elif hasattr(data, "content"):
-                        custom_text = getattr(data, "content", "")
-                    
-                    if custom_text and isinstance(custom_text, str) and custom_text not in self._emitted_texts:
-                        logger.info(f"📢 Custom event (tool message): {custom_text[:100]}")
-                        self._emitted_texts.add(custom_text)
-                        # Emit as its own turn
-                        if self._outer_open:
-                            await self.push_frame(LLMFullResponseEndFrame())
-                            self._outer_open = False
-                        await self.push_frame(LLMFullResponseStartFrame())
-                        await self.push_frame(LLMTextFrame(_tts_sanitize(custom_text)))
-                        await self.push_frame(LLMFullResponseEndFrame())
-
-                # Final value-style events (values mode)
-                if event == "values":
-                    # Some dev servers send final AI message content here
-                    final_text = ""
-                    logger.info(f"📊 Processing values event: data_type={type(data)}, is_background={is_background}")
-                    
-                    # Handle list of messages (most common case)
-                    if isinstance(data, list) and data:
-                        logger.info(f"📊 Data is list with {len(data)} items")
-                        # Find the last AI message in the list
-                        for msg in reversed(data):
-                            if isinstance(msg, dict):
-                                if msg.get("type") == "ai" and isinstance(msg.get("content"), str):
-                                    final_text = msg["content"]
-                                    logger.info(f"✅ Found AI message in dict: {final_text[:100]}")
-                                    break
-                            elif hasattr(msg, "type") and getattr(msg, "type") == "ai":
-                                content = getattr(msg, "content", None)
-                                if isinstance(content, str):
-                                    final_text = content
-                                    logger.info(f"✅ Found AI message in object: {final_text[:100]}")
-                                    break
-                    # Handle single message object
-                    elif hasattr(data, "content") and isinstance(getattr(data, "content"), str):
-                        final_text = getattr(data, "content")
-                        logger.info(f"✅ Found content in object: {final_text[:100]}")
-                    # Handle single message dict
-                    elif isinstance(data, dict):
-                        c = data.get("content")
-                        if isinstance(c, str):
-                            final_text = c
-                            logger.info(f"✅ Found content in dict: {final_text[:100]}")
-                    
-                    if final_text and final_text not in self._emitted_texts:
-                        if is_background:
-                            # Running in background - capture for later injection
-                            # Only capture if there's no pending message waiting to be injected
-                            if not self._background_final_message:
-                                logger.info("💾 Capturing final message from background task")
-                                self._background_final_message = final_text
-                                self._emitted_texts.add(final_text)
-                            else:
-                                logger.info(f"⚠️  Skipping capture - pending message already exists: {self._background_final_message[:50]}...")
-                            # Close any open utterance
-                            if self._outer_open:
-                                await self.push_frame(LLMFullResponseEndFrame())
-                                self._outer_open = False
-                        else:
-                            # Normal foreground - push immediately
-                            # Close backchannel utterance if open
-                            if self._outer_open:
-                                await self.push_frame(LLMFullResponseEndFrame())
-                                self._outer_open = False
-                            # Emit final explanation as its own message
-                            self._emitted_texts.add(final_text)
-                            await self.push_frame(LLMFullResponseStartFrame())
-                            await self.push_frame(LLMTextFrame(_tts_sanitize(final_text)))
-                            await self.push_frame(LLMFullResponseEndFrame())
+                # Dispatch on the event name: exact names first, then token and namespaced messages events
+                handler = _EVENT_HANDLERS.get(event)
+                if handler is None:
+                    if "on_chat_model_stream" in event:
+                        handler = LangGraphLLMService._on_token_event
+                    elif event.endswith(":messages"):
+                        handler = LangGraphLLMService._on_messages_event
+                if handler is not None:
+                    await handler(self, data, stream)
 
-                # Messages mode: look for an array of messages
-                if event == "messages" or event.endswith(":messages"):
-                    try:
-                        msgs = None
-                        if isinstance(data, dict):
-                            msgs = data.get("messages") or data.get("result") or data.get("value")
-                        elif hasattr(data, "messages"):
-                            msgs = getattr(data, "messages")
-                        if isinstance(msgs, list) and msgs:
-                            last = msgs[-1]
-                            content = getattr(last, "content", None)
-                            if content is None and isinstance(last, dict):
-                                content = last.get("content")
-                            if isinstance(content, str) and content:
-                                if not self._outer_open:
-                                    await self.push_frame(LLMFullResponseStartFrame())
-                                    self._outer_open = True
-                                    self._emitted_texts.clear()
-                                if content not in self._emitted_texts:
-                                    self._emitted_texts.add(content)
-                                    await self.push_frame(LLMTextFrame(_tts_sanitize(content)))
-                    except Exception as exc:  # noqa: BLE001
-                        logger.debug(f"LangGraph messages parsing error: {exc}")
                 # If payload is a plain string, emit it
                 if isinstance(data, str):
                     txt = data.strip()
@@ -446,10 +655,11 @@ class LangGraphLLMService(OpenAILLMService):
                         if not self._outer_open:
                             await self.push_frame(LLMFullResponseStartFrame())
                             self._outer_open = True
-                            self._emitted_texts.clear()
-                        if txt not in self._emitted_texts:
-                            self._emitted_texts.add(txt)
+                            self._clear_emitted()
+                        if not self._is_emitted(txt):
+                            self._add_emitted(txt)
                             await self.push_frame(LLMTextFrame(_tts_sanitize(txt)))
+            await self._flush_tokens(stream)
         except Exception as exc:  # noqa: BLE001
             logger.error(f"LangGraph stream error: {exc}")
         finally:
@@ -464,7 +674,14 @@ class LangGraphLLMService(OpenAILLMService):
         logger.info(f"🎯 _stream_langgraph called: enable_multi_threading={self.enable_multi_threading}")
         thread_type = "main"
         if self.enable_multi_threading:
-            long_operation_running = await self._check_long_operation_running()
+            # The status lookup and thread creation are independent round-trips to the server, so they
+            # run together. Both threads are ensured up front because the status decides which one is
+            # used; after the first turn the thread ids are cached and only the lookup does I/O.
+            long_operation_running, _, _ = await asyncio.gather(
+                self._check_long_operation_running(),
+                self._ensure_thread("main"),
+                self._ensure_thread("secondary"),
+            )
             if long_operation_running:
                 thread_type = "secondary"
                 self._interim_messages_reset = False
@@ -478,17 +695,20 @@ class LangGraphLLMService(OpenAILLMService):
                     self._interim_messages_reset = True
                 logger.info("▶️  No long operation, routing to main thread")
         
-        # Ensure appropriate thread
+        # Ensure appropriate thread (already created above when multi-threading)
         thread_id = await self._ensure_thread(thread_type)
         
-        # Build config with namespace for store coordination
-        config = {
-            "configurable": {
-                "user_email": self.user_email,
-                "thread_id": thread_id,
-                "namespace_for_memory": list(self._namespace_for_memory),
+        # Config with namespace for store coordination
+        config = self._run_configs.get(thread_id)
+        if config is None:
+            config = {
+                "configurable": {
+                    "user_email": self.user_email,
+                    "thread_id": thread_id,
+                    "namespace_for_memory": self._namespace_list,
+                }
             }
-        }
+            self._run_configs[thread_id] = config
         
         # Build input dict for multi-threaded agent
         if self.enable_multi_threading:
@@ -506,19 +726,7 @@ class LangGraphLLMService(OpenAILLMService):
             logger.info("🚀 Starting main thread operation in background")
             
             # Cancel any existing background main task and monitor
-            if self._background_main_task is not None and not self._background_main_task.done():
-                logger.info("⚠️  Canceling previous background main task")
-                self._background_main_task.cancel()
-                try:
-                    await self._background_main_task
-                except asyncio.CancelledError:
-                    pass
-            if self._background_monitor_task is not None and not self._background_monitor_task.done():
-                self._background_monitor_task.cancel()
-                try:
-                    await self._background_monitor_task
-                except asyncio.CancelledError:
-                    pass
+            await self._cancel_background_tasks("⚠️  Canceling previous background main task")
             
             # Start new background task (with is_background=True to capture final message)
             self._background_main_task = asyncio.create_task(
@@ -544,7 +752,7 @@ class LangGraphLLMService(OpenAILLMService):
                 logger.debug("LangGraph: no user text in context; skipping run.")
                 return
             self._outer_open = False
-            self._emitted_texts.clear()
+            self._clear_emitted()
             await self._stream_langgraph(user_text)
         finally:
             if self._outer_open:
@@ -577,22 +785,7 @@ class LangGraphLLMService(OpenAILLMService):
             
             # Only cancel background tasks if NOT in a long operation (which should continue)
             if not long_op_running:
-                if self._background_main_task is not None and not self._background_main_task.done():
-                    logger.info("🛑 Canceling background main task due to interruption")
-                    self._background_main_task.cancel()
-                    try:
-                        await self._background_main_task
-                    except asyncio.CancelledError:
-                        pass
-                    self._background_main_task = None
-                if self._background_monitor_task is not None and not self._background_monitor_task.done():
-                    logger.info("🛑 Canceling background monitor task due to interruption")
-                    self._background_monitor_task.cancel()
-                    try:
-                        await self._background_monitor_task
-                    except asyncio.CancelledError:
-                        pass
-                    self._background_monitor_task = None
+                await self._cancel_background_tasks("🛑 Canceling background tasks due to interruption")
             else:
                 logger.info("🔄 Long operation running - keeping background tasks alive, secondary will handle interruption")
             return
@@ -609,3 +802,9 @@ class LangGraphLLMService(OpenAILLMService):
             self._current_task.add_done_callback(lambda _: setattr(self, "_current_task", None))
 
 
+# Stream event name -> handler, resolved once instead of comparing each chunk's event against every mode
+_EVENT_HANDLERS = {
+    "custom": LangGraphLLMService._on_custom_event,
+    "values": LangGraphLLMService._on_values_event,
+    "messages": LangGraphLLMService._on_messages_event,
+}
@@ -298,11 +298,17 @@ async def run_bot(webrtc_connection, ws: WebSocket, assistant_override: str | No
     enable_multi_threading = assistant_name in ["telco-agent", "wire-transfer-agent"]
     logger.info(f"Multi-threading enabled: {enable_multi_threading} for assistant: {assistant_name}")
     
+    # The multi-threaded agents stream their LLM tokens so TTS starts on the first sentence;
+    # set LANGGRAPH_STREAM_TOKENS=false to only speak final messages
+    stream_mode = None  # service default: ["values", "custom"] for multi-thread, "values" for single
+    if enable_multi_threading and os.getenv("LANGGRAPH_STREAM_TOKENS", "true").lower() == "true":
+        stream_mode = ["values", "custom", "messages-tuple"]
+
     llm = LangGraphLLMService(
         base_url=os.getenv("LANGGRAPH_BASE_URL", "http://127.0.0.1:2024"),
         assistant=selected_assistant,
         user_email=os.getenv("USER_EMAIL", "test@example.com"),
-        # stream_mode now auto-set based on enable_multi_threading (["values", "custom"] for multi-thread, "values" for single)
+        stream_mode=stream_mode,
         debug_stream=os.getenv("LANGGRAPH_DEBUG_STREAM", "false").lower() == "true",
         enable_multi_threading=enable_multi_threading,
     )
@@ -0,0 +1,271 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024-2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD 2-Clause License
+
+"""NVIDIA RAG service with an approximate response cache.
+
+Voice traffic against a knowledge base is heavily skewed: the same few questions recur, often
+with slightly different wording. `CachedNvidiaRAGService` embeds the latest user query with a
+small local sentence transformer, hashes the embedding into locality-sensitive buckets and
+replays the cached RAG stream when a previous query in the same buckets is similar enough,
+skipping the round-trip to the RAG server (retrieval, reranking and generation).
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+
+import numpy as np
+from loguru import logger
+
+from nvidia_pipecat.services.nvidia_rag import NvidiaRAGService
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_model_lock = threading.Lock()
+
+
+@functools.cache
+def _load_embedding_model(model_name: str):
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    return SentenceTransformer(model_name, device="cpu")
+
+
+def _get_embedding_model(model_name: str):
+    # Serialized so concurrent first requests load the model once
+    with _model_lock:
+        return _load_embedding_model(model_name)
+
+
+@dataclass
+class _CacheEntry:
+    embedding: np.ndarray
+    lines: list[str]
+    created_at: float
+    bucket_keys: list[tuple[str, int, bytes]]
+
+
+class RAGResponseCache:
+    """Bounded LRU + TTL cache of RAG response streams indexed by LSH buckets of the query embedding.
+
+    Args:
+        dimension: Dimension of the query embeddings.
+        maxsize: Maximum number of cached responses.
+        ttl: Time to live of a cached response in seconds.
+        similarity_threshold: Minimum cosine similarity for a cache hit.
+        num_tables: Number of random projection tables.
+        bits_per_table: Number of hyperplanes (bits) per table.
+        seed: Seed for the random projections.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        similarity_threshold: float = 0.9,
+        num_tables: int = 8,
+        bits_per_table: int = 16,
+        seed: int = 0,
+    ):
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self._projections = (
+            np.random.default_rng(seed).standard_normal((num_tables, bits_per_table, dimension)).astype(np.float32)
+        )
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        self._buckets: dict[tuple[str, int, bytes], list[int]] = {}
+        self._next_id = 0
+
+    def _bucket_keys(self, settings_key: str, embedding: np.ndarray) -> list[tuple[str, int, bytes]]:
+        bits = (self._projections @ embedding) > 0
+        return [(settings_key, table, np.packbits(table_bits).tobytes()) for table, table_bits in enumerate(bits)]
+
+    def __len__(self) -> int:
+        """Returns the number of cached responses."""
+        return len(self._entries)
+
+    def _remove(self, entry_id: int) -> None:
+        """Removes an entry and its ids from the buckets, dropping buckets that become empty."""
+        entry = self._entries.pop(entry_id)
+        for bucket_key in entry.bucket_keys:
+            bucket = self._buckets[bucket_key]
+            bucket.remove(entry_id)
+            if not bucket:
+                del self._buckets[bucket_key]
+
+    def get(self, settings_key: str, embedding: np.ndarray) -> list[str] | None:
+        """Returns the cached response lines of the most similar query, or None on a miss."""
+        now = time.monotonic()
+        best_id, best_score = None, self.similarity_threshold
+        expired = set()
+        for bucket_key in self._bucket_keys(settings_key, embedding):
+            for entry_id in self._buckets.get(bucket_key, ()):
+                entry = self._entries[entry_id]
+                if now - entry.created_at >= self.ttl:
+                    expired.add(entry_id)
+                    continue
+                score = float(np.dot(embedding, entry.embedding))
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+        for entry_id in expired:
+            self._remove(entry_id)
+        if best_id is None:
+            return None
+        self._entries.move_to_end(best_id)
+        return self._entries[best_id].lines
+
+    def put(self, settings_key: str, embedding: np.ndarray, lines: list[str]) -> None:
+        """Caches the response lines for a query embedding."""
+        entry_id = self._next_id
+        self._next_id += 1
+        bucket_keys = self._bucket_keys(settings_key, embedding)
+        self._entries[entry_id] = _CacheEntry(embedding, lines, time.monotonic(), bucket_keys)
+        for bucket_key in bucket_keys:
+            self._buckets.setdefault(bucket_key, []).append(entry_id)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+
+
+class _CachedResponse:
+    """Replays cached RAG response lines with the interface used by `NvidiaRAGService`."""
+
+    def __init__(self, lines: list[str]):
+        self._lines = lines
+
+    async def aiter_lines(self) -> AsyncIterator[str]:
+        for line in self._lines:
+            yield line
+
+    async def aclose(self):
+        pass
+
+
+class _RecordingResponse:
+    """Wraps a RAG response and hands its lines to a callback once the stream completed successfully."""
+
+    def __init__(self, response, on_complete: Callable[[list[str]], None]):
+        self._response = response
+        self._on_complete = on_complete
+
+    async def aiter_lines(self) -> AsyncIterator[str]:
+        lines = []
+        async for line in self._response.aiter_lines():
+            lines.append(line)
+            yield line
+        if self._response.status_code == 200:
+            self._on_complete(lines)
+
+    async def aclose(self):
+        await self._response.aclose()
+
+
+class CachedNvidiaRAGService(NvidiaRAGService):
+    """NvidiaRAGService that serves near-duplicate queries from an approximate response cache.
+
+    The cache is keyed on the latest user message, the earlier conversation turns and the request
+    settings (collection, sampling and retrieval parameters), so a follow-up question is only
+    answered from the cache within the same conversation history. It is shared by all instances in
+    the process that use the same embedding model and cache settings, like the HTTP session, so
+    repeated questions from different sessions hit the same entries.
+
+    With interim transcripts enabled, requests are also sent for partial queries. A response is
+    therefore only cached once the next request shows that its query became a user turn of the
+    conversation, i.e. that it was the final transcript.
+
+    The embedding model is loaded on first use, and it is loaded and run in a worker thread so the
+    event loop is never blocked.
+
+    Args:
+        collection_name: Document collection identifier.
+        embedding_model: Sentence transformer used to embed queries. Defaults to "all-MiniLM-L6-v2".
+        cache_size: Maximum number of cached responses. Defaults to 1024.
+        cache_ttl: Time to live of a cached response in seconds. Defaults to 300.
+        similarity_threshold: Minimum cosine similarity for a cache hit. Defaults to 0.9.
+        **kwargs: Additional arguments passed to NvidiaRAGService.
+    """
+
+    _shared_caches: dict[tuple[str, int, float, float], RAGResponseCache] = {}
+
+    def __init__(
+        self,
+        collection_name: str,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+        cache_size: int = 1024,
+        cache_ttl: float = 300.0,
+        similarity_threshold: float = 0.9,
+        **kwargs,
+    ):
+        """Initialize the cached NVIDIA RAG service."""
+        super().__init__(collection_name, **kwargs)
+        self._embedding_model_name = embedding_model
+        self._cache_settings = (embedding_model, cache_size, cache_ttl, similarity_threshold)
+        # (query, settings key, embedding, response lines) of the last completed uncached response
+        self._pending_put: tuple[str, str, np.ndarray, list[str]] | None = None
+
+    def _embed(self, text: str) -> np.ndarray:
+        model = _get_embedding_model(self._embedding_model_name)
+        return model.encode(text, normalize_embeddings=True, show_progress_bar=False).astype(np.float32)
+
+    def _get_cache(self, dimension: int) -> RAGResponseCache:
+        cache = CachedNvidiaRAGService._shared_caches.get(self._cache_settings)
+        if cache is None:
+            _, cache_size, cache_ttl, similarity_threshold = self._cache_settings
+            cache = RAGResponseCache(
+                dimension=dimension,
+                maxsize=cache_size,
+                ttl=cache_ttl,
+                similarity_threshold=similarity_threshold,
+            )
+            CachedNvidiaRAGService._shared_caches[self._cache_settings] = cache
+        return cache
+
+    def _commit_pending_put(self, history: list[dict]) -> None:
+        """Caches the previous response if its query is a user turn of the new conversation history.
+
+        A query that was replaced by a later interim or final transcript is not part of the history,
+        and its response is dropped.
+        """
+        pending, self._pending_put = self._pending_put, None
+        if pending is None:
+            return
+        query, settings_key, embedding, lines = pending
+        # The suffix prompt is only appended to the latest user message of a request
+        suffix = f" {self.suffix_prompt}" if self.suffix_prompt else ""
+        if any(m["role"] == "user" and m["content"] + suffix == query for m in history):
+            self._get_cache(embedding.shape[0]).put(settings_key, embedding, lines)
+
+    def _set_pending_put(self, query: str, settings_key: str, embedding: np.ndarray, lines: list[str]) -> None:
+        self._pending_put = (query, settings_key, embedding, lines)
+
+    async def _get_rag_response(self, request_json: dict):
+        messages = request_json["messages"]
+        last_user = next((i for i in range(len(messages) - 1, -1, -1) if messages[i]["role"] == "user"), None)
+        history = messages[:last_user] if last_user is not None else messages
+        self._commit_pending_put(history)
+
+        query = messages[last_user]["content"] if last_user is not None else ""
+        if not query.strip():
+            return await super()._get_rag_response(request_json)
+
+        settings = {k: v for k, v in request_json.items() if k != "messages"}
+        settings_key = hashlib.sha256(
+            json.dumps({"settings": settings, "history": history}, sort_keys=True).encode()
+        ).hexdigest()
+        embedding = await asyncio.to_thread(self._embed, query.strip().lower())
+        cache = self._get_cache(embedding.shape[0])
+        lines = cache.get(settings_key, embedding)
+        if lines is not None:
+            logger.debug(f"RAG cache hit for query '{query}'")
+            return _CachedResponse(lines)
+
+        response = await super()._get_rag_response(request_json)
+        return _RecordingResponse(response, functools.partial(self._set_pending_put, query, settings_key, embedding))
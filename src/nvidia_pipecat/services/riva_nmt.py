@@ -10,6 +10,8 @@ between different languages. It supports:
 - Integration with LLM and sentence aggregation pipelines
 """
 
+import asyncio
+import functools
 import re
 
 from loguru import logger
@@ -25,6 +27,7 @@ from pipecat.frames.frames import (
 from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.ai_service import AIService
 from pipecat.transcriptions.language import Language
+from pipecat.utils.string import match_endofsentence
 
 try:
     import riva.client
@@ -34,6 +37,16 @@ except ModuleNotFoundError as e:
     raise Exception(f"Missing module: {e}") from e
 
 
+@functools.cache
+def _get_riva_nmt_auth(server: str) -> riva.client.Auth:
+    """Returns a Riva auth object whose gRPC channel is shared by all NMT services using the same server.
+
+    A pipeline usually translates in both directions with two service instances (before and after
+    the LLM); they multiplex their requests over one channel instead of opening one each.
+    """
+    return riva.client.Auth(uri=server)
+
+
 class RivaNMTService(AIService):
     """Base class for services using Riva NMT.
 
@@ -73,7 +86,7 @@ class RivaNMTService(AIService):
         self.target_language = target_language
         self.llm_full_response_started = False
         self.llm_full_response = ""
-        self.auth = riva.client.Auth(uri=server)
+        self.auth = _get_riva_nmt_auth(server)
         self.riva_nmt_client = riva.client.NeuralMachineTranslationClient(self.auth)
 
     async def translate_text(self, text: str = "") -> tuple[str | None, str | None]:
@@ -96,8 +109,9 @@ class RivaNMTService(AIService):
 
             logger.debug(f"Received text: {text}")
             logger.debug(f"Translating the text from {self.source_language} to {self.target_language}")
-            response = self.riva_nmt_client.translate(
-                [text], self._model_name, self.source_language, self.target_language
+            # The Riva client is blocking, keep the event loop free while the request is in flight
+            response = await asyncio.to_thread(
+                self.riva_nmt_client.translate, [text], self._model_name, self.source_language, self.target_language
             )
             logger.debug(f"Final translated text: {response.translations[0].text}")
             return response.translations[0].text, None
@@ -116,8 +130,9 @@ class RivaNMTService(AIService):
         Handles different frame types:
             - TranscriptionFrame: Translates text and pushes LLMMessagesFrame
             - LLMFullResponseStartFrame: Marks start of LLM response
-            - LLMFullResponseEndFrame: Translates accumulated response and pushes TextFrame
-            - TextFrame: Accumulates text during LLM response
+            - TextFrame: Accumulates text during LLM response and translates it one sentence
+              at a time, so TTS can start on the first sentence while the LLM is still generating
+            - LLMFullResponseEndFrame: Translates the remaining partial sentence, if any
 
         Args:
             frame: Frame to process.
@@ -136,22 +151,31 @@ class RivaNMTService(AIService):
                 await self.push_frame(LLMMessagesFrame(messages))
         elif isinstance(frame, LLMFullResponseStartFrame):
             self.llm_full_response_started = True
+            self.llm_full_response = ""
         elif isinstance(frame, LLMFullResponseEndFrame):
             self.llm_full_response_started = False
-            # Removing period, question mark, exclamation point, colon, or semicolon
-            # as these match end of sentence regex in
-            # _process_text_frame() method of TTSService of pipecat/services/ai_services.py
-            # and TTS response gets truncated.
-            await self.start_processing_metrics()
-            self.llm_full_response = re.sub("[.?!:;]", "", self.llm_full_response)
-            translated_text, err = await self.translate_text(self.llm_full_response)
-            await self.stop_processing_metrics()
-            if err is not None:
-                await self.push_error(ErrorFrame(err))
-            else:
-                await self.push_frame(TextFrame(translated_text + "."))
-            self.llm_full_response = ""
+            await self._translate_response_text()
         elif self.llm_full_response_started and isinstance(frame, TextFrame):
             self.llm_full_response += frame.text
+            if match_endofsentence(self.llm_full_response):
+                await self._translate_response_text()
         else:
             await self.push_frame(frame, direction)
+
+    async def _translate_response_text(self) -> None:
+        """Translates the accumulated LLM response text and pushes it as a TextFrame."""
+        # Removing period, question mark, exclamation point, colon, or semicolon
+        # as these match end of sentence regex in
+        # _process_text_frame() method of TTSService of pipecat/services/ai_services.py
+        # and TTS response gets truncated.
+        text = re.sub("[.?!:;]", "", self.llm_full_response).strip()
+        self.llm_full_response = ""
+        if not text:
+            return
+        await self.start_processing_metrics()
+        translated_text, err = await self.translate_text(text)
+        await self.stop_processing_metrics()
+        if err is not None:
+            await self.push_error(ErrorFrame(err))
+        else:
+            await self.push_frame(TextFrame(translated_text + "."))
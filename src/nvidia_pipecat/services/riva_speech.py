@@ -16,6 +16,7 @@ For documentation on how to configure the Riva Speech models, please refer to th
 
 import asyncio
 import concurrent.futures
+import functools
 from collections.abc import AsyncGenerator
 from pathlib import Path
 
@@ -48,6 +49,21 @@ from nvidia_pipecat.frames.riva import RivaInterimTranscriptionFrame
 from nvidia_pipecat.utils.tracing import AttachmentStrategy, traceable, traced
 
 
+@functools.cache
+def _get_riva_auth(server: str, use_ssl: bool, function_id: str, api_key: str | None) -> riva.client.Auth:
+    """Returns a Riva auth object whose gRPC channel is shared across services and sessions.
+
+    gRPC channels are thread-safe and multiplex concurrent streams, so every service talking to the
+    same server with the same credentials reuses one channel instead of paying a new connection
+    (and TLS handshake for NVCF) per pipeline.
+    """
+    metadata = [
+        ["function-id", function_id],
+        ["authorization", f"Bearer {api_key}"],
+    ]
+    return riva.client.Auth(None, use_ssl, server, metadata)
+
+
 @traceable
 class RivaTTSService(TTSService):
     """NVIDIA Riva Text-to-Speech service implementation.
@@ -126,16 +142,11 @@ class RivaTTSService(TTSService):
         self._zero_shot_audio_prompt_file = zero_shot_audio_prompt_file
         self._audio_prompt_encoding = audio_prompt_encoding
 
-        metadata = [
-            ["function-id", function_id],
-            ["authorization", f"Bearer {api_key}"],
-        ]
-
         if server == "grpc.nvcf.nvidia.com:443":
             use_ssl = True
 
         try:
-            auth = riva.client.Auth(None, use_ssl, server, metadata)
+            auth = _get_riva_auth(server, use_ssl, function_id, api_key)
             self._service = riva.client.SpeechSynthesisService(auth)
             # warm up the service
             _ = self._service.stub.GetRivaSynthesisConfig(riva.client.proto.riva_tts_pb2.RivaSynthesisConfigRequest())
@@ -158,6 +169,29 @@ class RivaTTSService(TTSService):
         """
         return True
 
+    async def warmup(self, text: str = "Hello.") -> None:
+        """Synthesize a short text and discard the audio.
+
+        Riva loads and initializes models lazily, so the first synthesis request is much slower
+        than the following ones. Call this at application startup to take that cost off the
+        first conversation.
+
+        Args:
+            text (str, optional): Text to synthesize. Defaults to "Hello.".
+        """
+        await asyncio.to_thread(
+            self._service.synthesize,
+            text,
+            self._voice_id,
+            self._language_code,
+            sample_rate_hz=self._sample_rate,
+            zero_shot_audio_prompt_file=self._zero_shot_audio_prompt_file,
+            audio_prompt_encoding=self._audio_prompt_encoding,
+            zero_shot_quality=self._zero_shot_quality,
+            custom_dictionary=self._custom_dictionary,
+            encoding=self._encoding,
+        )
+
     async def _push_tts_frames(self, text: str):
         """Override base class method to push text frames immediately."""
         # Remove leading newlines only
@@ -341,16 +375,11 @@ class RivaASRService(STTService):
         self.last_transcript_frame = None
         self.set_model_name(model)
 
-        metadata = [
-            ["function-id", function_id],
-            ["authorization", f"Bearer {api_key}"],
-        ]
-
         if server == "grpc.nvcf.nvidia.com:443":
             use_ssl = True
 
         try:
-            auth = riva.client.Auth(None, use_ssl, server, metadata)
+            auth = _get_riva_auth(server, use_ssl, function_id, api_key)
             self._asr_service = riva.client.ASRService(auth)
         except Exception as e:
             logger.error(
@@ -409,6 +438,26 @@ class RivaASRService(STTService):
         """
         return False
 
+    async def warmup(self, duration: float = 0.1) -> None:
+        """Run a short streaming recognition request on silence and discard the results.
+
+        Riva loads and initializes models lazily, so the first recognition request is much slower
+        than the following ones. Call this at application startup to take that cost off the
+        first conversation.
+
+        Args:
+            duration: Duration of the silent audio in seconds. Defaults to 0.1.
+        """
+        silence = bytes(int(self._sample_rate * duration) * 2 * self._audio_channel_count)
+
+        def _recognize():
+            for _ in self._asr_service.streaming_response_generator(
+                audio_chunks=[silence], streaming_config=self._config
+            ):
+                pass
+
+        await asyncio.to_thread(_recognize)
+
     async def start(self, frame: StartFrame):
         """Start the ASR service.
 
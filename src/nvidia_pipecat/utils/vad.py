@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024-2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD 2-Clause License
+
+"""Voice activity detection utilities."""
+
+import functools
+
+from pipecat.audio.vad.silero import SileroOnnxModel, SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+
+
+@functools.cache
+def _silero_session():
+    """Loads the Silero VAD ONNX model once per process and returns its inference session."""
+    return SileroVADAnalyzer()._model.session
+
+
+class _SharedSessionSileroOnnxModel(SileroOnnxModel):
+    """Silero model that runs on an already loaded ONNX inference session.
+
+    The inference session is stateless and thread-safe; the recurrent model state and the audio
+    context are kept per instance.
+    """
+
+    def __init__(self, session):
+        """Initialize the model with fresh state on the given inference session."""
+        self.session = session
+        self.sample_rates = [8000, 16000]
+        self.reset_states()
+
+
+class _SharedSessionSileroVADAnalyzer(SileroVADAnalyzer):
+    """Silero VAD analyzer that shares the process-wide ONNX inference session."""
+
+    def __init__(self, *, sample_rate: int | None = None, params: VADParams | None = None):
+        """Initialize the analyzer without loading the ONNX model again."""
+        # SileroVADAnalyzer.__init__ only loads the model on top of the base analyzer state
+        VADAnalyzer.__init__(self, sample_rate=sample_rate, params=params)
+        self._model = _SharedSessionSileroOnnxModel(_silero_session())
+        self._last_reset_time = 0
+
+
+def create_silero_vad_analyzer(params: VADParams | None = None) -> SileroVADAnalyzer:
+    """Creates a Silero VAD analyzer that shares the process-wide ONNX inference session.
+
+    Loading the Silero model is a fixed per-instance cost, so creating a fresh `SileroVADAnalyzer`
+    for every pipeline makes each new connection pay it. The returned analyzer is constructed with
+    its own analyzer state, recurrent model state and VAD buffers, and only reuses the loaded
+    inference session, so analyzers from concurrent sessions do not interfere with each other.
+
+    Args:
+        params (VADParams | None): VAD parameters for this analyzer. Defaults to VADParams().
+
+    Returns:
+        SileroVADAnalyzer: An analyzer ready to be passed to the transport params.
+    """
+    return _SharedSessionSileroVADAnalyzer(params=params)
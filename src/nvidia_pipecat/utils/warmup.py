@@ -0,0 +1,63 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024-2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD 2-Clause License
+
+"""Model warmup utilities."""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from fastapi import FastAPI
+from loguru import logger
+
+from nvidia_pipecat.services.riva_speech import RivaASRService, RivaTTSService
+
+
+async def warmup_riva_services(create_services: Callable[[], tuple[RivaASRService, RivaTTSService]]) -> None:
+    """Warms up the Riva ASR and TTS models so the first caller does not pay their load time.
+
+    The services are only created for the warmup requests and are cleaned up afterwards. Failures are
+    logged and otherwise ignored, since a cold model only slows down the first conversation.
+
+    Args:
+        create_services (Callable[[], tuple[RivaASRService, RivaTTSService]]): Factory returning the
+            ASR and TTS services configured like the ones used by the pipeline.
+    """
+    try:
+        stt, tts = create_services()
+    except Exception as e:
+        logger.warning(f"Riva warmup failed: {e}")
+        return
+    try:
+        await asyncio.gather(stt.warmup(), tts.warmup())
+        logger.info("Riva ASR and TTS models warmed up")
+    except Exception as e:
+        logger.warning(f"Riva warmup failed: {e}")
+    finally:
+        await asyncio.gather(stt.cleanup(), tts.cleanup(), return_exceptions=True)
+
+
+def riva_warmup_lifespan(
+    create_services: Callable[[], tuple[RivaASRService, RivaTTSService]],
+) -> Callable[[FastAPI], Any]:
+    """Creates a FastAPI lifespan that warms up the Riva models at application startup.
+
+    Warmup is enabled by setting RIVA_WARMUP=1, so local development restarts are not slowed down.
+
+    Args:
+        create_services (Callable[[], tuple[RivaASRService, RivaTTSService]]): Factory returning the
+            ASR and TTS services configured like the ones used by the pipeline.
+
+    Returns:
+        Callable[[FastAPI], Any]: A lifespan to pass to `FastAPI(lifespan=...)`.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        if os.getenv("RIVA_WARMUP") == "1":
+            await warmup_riva_services(create_services)
+        yield
+
+    return lifespan
@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024-2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD 2-Clause License
+
+"""Unit tests for the approximate RAG response cache."""
+
+import numpy as np
+import pytest
+
+from nvidia_pipecat.services import cached_nvidia_rag
+from nvidia_pipecat.services.cached_nvidia_rag import CachedNvidiaRAGService, RAGResponseCache
+from nvidia_pipecat.services.nvidia_rag import NvidiaRAGService
+
+DIMENSION = 16
+SETTINGS = '{"collection_name": "docs"}'
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the time seen by the cache."""
+    now = [1000.0]
+    monkeypatch.setattr(cached_nvidia_rag.time, "monotonic", lambda: now[0])
+    return now
+
+
+class _FakeResponse:
+    """Streams a fixed RAG response like an httpx response."""
+
+    status_code = 200
+
+    def __init__(self, text):
+        self._text = text
+
+    async def aiter_lines(self):
+        yield self._text
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def rag_service(monkeypatch):
+    """Cached RAG service with a fake embedding and RAG server that counts the server requests."""
+    monkeypatch.setattr(CachedNvidiaRAGService, "_shared_caches", {})
+    requests = []
+
+    async def get_rag_response(self, request_json):
+        requests.append(request_json)
+        return _FakeResponse(f"answer {len(requests)}")
+
+    monkeypatch.setattr(NvidiaRAGService, "_get_rag_response", get_rag_response)
+    monkeypatch.setattr(
+        CachedNvidiaRAGService,
+        "_embed",
+        lambda self, text: _unit(np.frombuffer(text.ljust(DIMENSION).encode()[:DIMENSION], dtype=np.uint8) + 1.0),
+    )
+    service = CachedNvidiaRAGService(collection_name="docs")
+    service.requests = requests
+    return service
+
+
+async def _ask(service, messages):
+    response = await service._get_rag_response({"messages": messages, "collection_name": "docs"})
+    return [line async for line in response.aiter_lines()]
+
+
+def test_hit_for_same_and_similar_query():
+    """Tests that the same and a near-duplicate query hit the cached response."""
+    cache = RAGResponseCache(dimension=DIMENSION, similarity_threshold=0.9)
+    query = _unit(np.arange(1, DIMENSION + 1))
+    cache.put(SETTINGS, query, ["line 1", "line 2"])
+
+    assert cache.get(SETTINGS, query) == ["line 1", "line 2"]
+    similar = _unit(np.arange(1, DIMENSION + 1) + 0.01)
+    assert cache.get(SETTINGS, similar) == ["line 1", "line 2"]
+
+
+def test_miss_for_dissimilar_query_and_other_settings():
+    """Tests that a dissimilar query or different request settings miss the cache."""
+    cache = RAGResponseCache(dimension=DIMENSION, similarity_threshold=0.9)
+    query = _unit(np.eye(DIMENSION)[0])
+    cache.put(SETTINGS, query, ["answer"])
+
+    assert cache.get(SETTINGS, _unit(np.eye(DIMENSION)[1])) is None
+    assert cache.get('{"collection_name": "other"}', query) is None
+
+
+def test_expired_entry_is_a_miss_and_is_removed(clock):
+    """Tests that an expired entry misses and is removed together with its buckets."""
+    cache = RAGResponseCache(dimension=DIMENSION, ttl=10.0)
+    query = _unit(np.arange(1, DIMENSION + 1))
+    cache.put(SETTINGS, query, ["answer"])
+
+    clock[0] += 9.0
+    assert cache.get(SETTINGS, query) == ["answer"]
+
+    clock[0] += 1.0
+    assert cache.get(SETTINGS, query) is None
+    assert len(cache) == 0
+    assert not cache._buckets
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Tests that the least recently used entry is evicted once the cache is full."""
+    cache = RAGResponseCache(dimension=DIMENSION, maxsize=2)
+    first, second, third = (_unit(np.eye(DIMENSION)[i]) for i in range(3))
+    cache.put(SETTINGS, first, ["first"])
+    cache.put(SETTINGS, second, ["second"])
+    # Touch the first entry so the second one is the least recently used
+    assert cache.get(SETTINGS, first) == ["first"]
+
+    cache.put(SETTINGS, third, ["third"])
+
+    assert len(cache) == 2
+    assert cache.get(SETTINGS, second) is None
+    assert cache.get(SETTINGS, first) == ["first"]
+    assert cache.get(SETTINGS, third) == ["third"]
+
+
+def test_buckets_stay_bounded():
+    """Tests that evicted entries are removed from the buckets."""
+    cache = RAGResponseCache(dimension=DIMENSION, maxsize=4, num_tables=3)
+    rng = np.random.default_rng(1)
+    for i in range(100):
+        cache.put(SETTINGS, _unit(rng.standard_normal(DIMENSION)), [str(i)])
+
+    assert len(cache) == 4
+    assert sum(len(bucket) for bucket in cache._buckets.values()) == 4 * 3
+
+
+async def test_query_is_cached_once_it_became_a_user_turn(rag_service):
+    """Tests that a response is only cached after the next request confirms its query was final."""
+    system = {"role": "system", "content": "You are a helpful assistant."}
+    question = {"role": "user", "content": "what is ace"}
+
+    assert await _ask(rag_service, [system, question]) == ["answer 1"]
+    # Not confirmed yet, so the same question from another session reaches the server
+    other_service = CachedNvidiaRAGService(collection_name="docs")
+    assert await _ask(other_service, [system, question]) == ["answer 2"]
+
+    follow_up = [system, question, {"role": "assistant", "content": "answer 1"}, {"role": "user", "content": "why"}]
+    assert await _ask(rag_service, follow_up) == ["answer 3"]
+    assert await _ask(other_service, [system, question]) == ["answer 1"]
+    assert len(rag_service.requests) == 3
+
+
+async def test_replaced_interim_query_is_not_cached(rag_service):
+    """Tests that the response to an interim query replaced by the final transcript is dropped."""
+    assert await _ask(rag_service, [{"role": "user", "content": "what is"}]) == ["answer 1"]
+    assert await _ask(rag_service, [{"role": "user", "content": "what is ace"}]) == ["answer 2"]
+    assert await _ask(rag_service, [{"role": "user", "content": "what is"}]) == ["answer 3"]
+
+
+async def test_follow_up_is_keyed_on_conversation_history(rag_service):
+    """Tests that the same follow-up question in a different conversation misses the cache."""
+    first = [{"role": "user", "content": "what is ace"}, {"role": "assistant", "content": "a sdk"}]
+    second = [{"role": "user", "content": "what is riva"}, {"role": "assistant", "content": "speech ai"}]
+    follow_up = {"role": "user", "content": "tell me more"}
+
+    await _ask(rag_service, [*first, follow_up])
+    await _ask(
+        rag_service, [*first, follow_up, {"role": "assistant", "content": "more"}, {"role": "user", "content": "ok"}]
+    )
+    assert len(rag_service._get_cache(DIMENSION)) == 1
+
+    assert await _ask(rag_service, [*second, follow_up]) == ["answer 3"]
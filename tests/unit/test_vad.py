@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024-2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: BSD 2-Clause License
+
+"""Unit tests for the shared Silero VAD analyzer."""
+
+import numpy as np
+from pipecat.audio.vad.vad_analyzer import VADParams
+
+from nvidia_pipecat.utils.vad import create_silero_vad_analyzer
+
+
+def _speech_like_audio(num_samples: int) -> bytes:
+    t = np.arange(num_samples) / 16000
+    return (np.sin(2 * np.pi * 220 * t) * 16000).astype(np.int16).tobytes()
+
+
+def test_analyzers_share_session_and_keep_independent_state():
+    """Tests that two analyzers share the ONNX session but not their analyzer and model state."""
+    first = create_silero_vad_analyzer(VADParams(confidence=0.5))
+    second = create_silero_vad_analyzer()
+
+    assert first._model.session is second._model.session
+    assert first._model is not second._model
+    assert first.params.confidence == 0.5
+    assert second.params == VADParams()
+
+    first.set_sample_rate(16000)
+    second.set_sample_rate(16000)
+    first.analyze_audio(_speech_like_audio(first.num_frames_required() * 3 // 2))
+    first.voice_confidence(_speech_like_audio(first.num_frames_required()))
+
+    assert first._vad_buffer
+    assert not second._vad_buffer
+    assert first._model._last_sr == 16000
+    assert second._model._last_sr == 0
+    assert not np.any(second._model._state)